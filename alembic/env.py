@@ -12,7 +12,7 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from sqlmodel import SQLModel
 
 from alembic import context
-from app.core.config import settings
+from app.core.config import get_settings
 from app.models.item import Producto  
 
 # Configuración de Alembic (lee el alembic.ini)
@@ -25,7 +25,7 @@ if config.config_file_name is not None:
 # Asignar la metadata de tus modelos a Alembic
 target_metadata = SQLModel.metadata
 
-config.set_main_option("sqlalchemy.url", str(settings.DATABASE_URL))
+config.set_main_option("sqlalchemy.url", str(get_settings().DATABASE_URL))
 
 
 def run_migrations_offline() -> None:
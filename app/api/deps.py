@@ -0,0 +1,33 @@
+from contextlib import asynccontextmanager
+from fastapi import HTTPException, status
+from app.core.admission import Prioridad, SobrecargaError, get_admission
+
+
+@asynccontextmanager
+async def reserva(prioridad: Prioridad, protocolo: str):
+    """Reserva un hueco en el control de admisión o responde 503 con `Retry-After`."""
+    admission = get_admission()
+    try:
+        await admission.adquirir(protocolo, prioridad)
+    except SobrecargaError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor saturado, reintente más tarde",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    try:
+        yield
+    finally:
+        admission.liberar(protocolo)
+
+
+def admitir(prioridad: Prioridad, protocolo: str = "rest"):
+    """Dependencia que reserva un hueco en el control de admisión durante la petición.
+
+    Si no hay capacidad responde 503 con `Retry-After` antes de tocar la base de datos.
+    """
+    async def dependencia():
+        async with reserva(prioridad, protocolo):
+            yield
+
+    return dependencia
@@ -1,31 +1,130 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional, Sequence
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic_core import to_json
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import admitir
+from app.core.admission import Prioridad
 from app.core.database import get_session
-from app.models.item import Producto, ProductoCreate, ProductoUpdate
-from app.repositories.producto_repository import ProductoRepository
+from app.models.item import (
+    Producto,
+    ProductoCreate,
+    ProductoParcial,
+    ProductoReprice,
+    ProductoRepriceResult,
+    ProductoUpdate,
+)
+from app.repositories.producto_repository import ProductoRepository, resolver_campos
 
 router = APIRouter()
 
-@router.post("/", response_model=Producto, status_code=status.HTTP_201_CREATED)
+
+def get_campos(
+    fields: Optional[str] = Query(
+        None,
+        description="Lista de campos separados por coma (ej. id,nombre,precio). El id siempre se incluye.",
+    )
+) -> Optional[tuple[str, ...]]:
+    if fields is None:
+        return None
+    try:
+        return resolver_campos(fields.split(","))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def filas_a_json(filas: Sequence[tuple] | Row) -> Response:
+    """Serializa filas de solo lectura directamente a JSON, sin instanciar un modelo por fila.
+
+    Solo contienen las columnas consultadas, así que equivale a `response_model_exclude_unset`.
+    """
+    if isinstance(filas, Row):
+        contenido = dict(zip(filas._fields, filas))
+    else:
+        claves = filas[0]._fields if filas else ()
+        contenido = [dict(zip(claves, fila)) for fila in filas]
+    return Response(content=to_json(contenido), media_type="application/json")
+
+@router.post(
+    "/",
+    response_model=Producto,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(admitir(Prioridad.PUNTUAL))],
+)
 async def create_item(item: ProductoCreate, session: AsyncSession = Depends(get_session)):
     # Se actualizó ItemRepository por ProductoRepository
     repo = ProductoRepository(session)
     return await repo.create(item)
 
-@router.get("/", response_model=list[Producto])
-async def read_items(session: AsyncSession = Depends(get_session)):
+@router.post(
+    "/reprice",
+    response_model=ProductoRepriceResult,
+    dependencies=[Depends(admitir(Prioridad.MASIVA))],
+)
+async def reprice_items(datos: ProductoReprice, session: AsyncSession = Depends(get_session)):
+    # Un único UPDATE por filtro (o por lotes de id); con dry_run solo cuenta las filas
+    repo = ProductoRepository(session)
+    return await repo.reprice(datos)
+
+@router.get(
+    "/por-precio",
+    response_model=list[ProductoParcial],
+    response_model_exclude_unset=True,
+    dependencies=[Depends(admitir(Prioridad.LISTADO))],
+)
+async def read_items_por_precio(
+    precio_min: Optional[float] = None,
+    precio_max: Optional[float] = None,
+    limite: Optional[int] = Query(None, gt=0),
+    descendente: bool = False,
+    session: AsyncSession = Depends(get_session),
+):
+    # Rango [precio_min, precio_max) ordenado por precio; con `limite` equivale a un top-N
+    repo = ProductoRepository(session)
+    return filas_a_json(await repo.get_by_precio(precio_min, precio_max, limite, descendente))
+
+@router.get("/por-precio/percentil", dependencies=[Depends(admitir(Prioridad.LISTADO))])
+async def read_percentil_precio(
+    q: float = Query(..., ge=0, le=1),
+    session: AsyncSession = Depends(get_session),
+):
+    repo = ProductoRepository(session)
+    return {"q": q, "precio": await repo.get_percentil_precio(q)}
+
+@router.get(
+    "/",
+    response_model=list[ProductoParcial],
+    response_model_exclude_unset=True,
+    dependencies=[Depends(admitir(Prioridad.LISTADO))],
+)
+async def read_items(
+    campos: Optional[tuple[str, ...]] = Depends(get_campos),
+    session: AsyncSession = Depends(get_session),
+):
     repo = ProductoRepository(session)
-    return await repo.get_all()
+    return filas_a_json(await repo.get_all_filas(campos))
 
-@router.get("/{item_id}", response_model=Producto)
-async def read_item(item_id: int, session: AsyncSession = Depends(get_session)):
+@router.get(
+    "/{item_id}",
+    response_model=ProductoParcial,
+    response_model_exclude_unset=True,
+    dependencies=[Depends(admitir(Prioridad.PUNTUAL))],
+)
+async def read_item(
+    item_id: int,
+    campos: Optional[tuple[str, ...]] = Depends(get_campos),
+    session: AsyncSession = Depends(get_session),
+):
     repo = ProductoRepository(session)
-    item = await repo.get_by_id(item_id)
-    if not item:
+    fila = await repo.get_by_id_fila(item_id, campos)
+    if not fila:
         raise HTTPException(status_code=404, detail="Producto no encontrado")
-    return item
+    return filas_a_json(fila)
 
-@router.patch("/{item_id}", response_model=Producto)
+@router.patch(
+    "/{item_id}",
+    response_model=Producto,
+    dependencies=[Depends(admitir(Prioridad.PUNTUAL))],
+)
 async def update_item(item_id: int, item_update: ProductoUpdate, session: AsyncSession = Depends(get_session)):
     repo = ProductoRepository(session)
     updated_item = await repo.update(item_id, item_update)
@@ -33,7 +132,11 @@ async def update_item(item_id: int, item_update: ProductoUpdate, session: AsyncS
         raise HTTPException(status_code=404, detail="Producto no encontrado")
     return updated_item
 
-@router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{item_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(admitir(Prioridad.PUNTUAL))],
+)
 async def delete_item(item_id: int, session: AsyncSession = Depends(get_session)):
     repo = ProductoRepository(session)
     success = await repo.delete(item_id)
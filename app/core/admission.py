@@ -0,0 +1,193 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from functools import lru_cache
+
+from app.core.config import get_settings
+
+
+class Prioridad(IntEnum):
+    """Clase de petición; un valor menor se atiende antes."""
+    PUNTUAL = 0     # lecturas/escrituras de un solo producto por id
+    LISTADO = 1     # listados completos (y operaciones GraphQL sin clasificar)
+    MASIVA = 2      # escrituras masivas
+
+
+class SobrecargaError(Exception):
+    """La petición fue rechazada por el control de admisión."""
+
+    def __init__(self, protocolo: str, retry_after: int):
+        super().__init__(f"Capacidad agotada para {protocolo}")
+        self.protocolo = protocolo
+        self.retry_after = retry_after
+
+
+class _Carril:
+    """Estado de admisión de un protocolo: límite adaptativo, peticiones en curso y cola."""
+
+    def __init__(self, limite_max: int):
+        self.limite_max = limite_max
+        self.limite = float(limite_max)
+        self.en_curso = 0
+        self.cola: list[tuple[int, int, asyncio.Future]] = []
+
+    def hay_hueco(self) -> bool:
+        return self.en_curso < max(1, int(self.limite))
+
+
+class AdmissionController:
+    """Limita la concurrencia por protocolo delante del pool de la base de datos.
+
+    Cada protocolo tiene un límite de peticiones en curso. Las que lo exceden esperan en
+    una cola acotada ordenada por prioridad y con plazo máximo; si la cola está llena o el
+    plazo vence se rechazan de inmediato (HTTP 503 / gRPC RESOURCE_EXHAUSTED). Los límites
+    se ajustan (AIMD) según la espera observada al pedir conexiones al pool.
+    """
+
+    def __init__(
+        self,
+        limites: dict[str, int],
+        max_cola: int = 128,
+        espera_max: float = 2.0,
+        espera_pool_objetivo: float = 0.05,
+        retry_after: int = 1,
+        limite_min: int = 1,
+        intervalo_recorte: float = 0.1,
+    ):
+        self.carriles = {protocolo: _Carril(limite) for protocolo, limite in limites.items()}
+        self.max_cola = max_cola
+        self.espera_max = espera_max
+        self.espera_pool_objetivo = espera_pool_objetivo
+        self.retry_after = retry_after
+        self.limite_min = limite_min
+        self.intervalo_recorte = intervalo_recorte
+        self._ultimo_recorte = 0.0
+        self.espera_pool = 0.0  # media móvil exponencial (segundos)
+        self.rechazadas = 0
+        self._secuencia = itertools.count()
+
+    @classmethod
+    def desde_settings(cls) -> "AdmissionController":
+        settings = get_settings()
+        return cls(
+            limites={
+                "rest": settings.ADMISSION_LIMITE_REST,
+                "graphql": settings.ADMISSION_LIMITE_GRAPHQL,
+                "grpc": settings.ADMISSION_LIMITE_GRPC,
+            },
+            max_cola=settings.ADMISSION_MAX_COLA,
+            espera_max=settings.ADMISSION_ESPERA_MAX,
+            espera_pool_objetivo=settings.ADMISSION_ESPERA_POOL_OBJETIVO,
+            retry_after=settings.ADMISSION_RETRY_AFTER,
+        )
+
+    def _rechazar(self, protocolo: str) -> SobrecargaError:
+        self.rechazadas += 1
+        return SobrecargaError(protocolo, self.retry_after)
+
+    async def adquirir(self, protocolo: str, prioridad: Prioridad = Prioridad.PUNTUAL) -> None:
+        carril = self.carriles[protocolo]
+        if carril.hay_hueco() and not carril.cola:
+            carril.en_curso += 1
+            return
+
+        if len(carril.cola) >= self.max_cola:
+            # Cola llena: solo entra si desplaza a una petición de menor prioridad
+            peor = max(carril.cola)
+            if peor[0] <= prioridad:
+                raise self._rechazar(protocolo)
+            carril.cola.remove(peor)
+            heapq.heapify(carril.cola)
+            if not peor[2].done():
+                peor[2].set_exception(self._rechazar(protocolo))
+
+        futuro = asyncio.get_running_loop().create_future()
+        heapq.heappush(carril.cola, (int(prioridad), next(self._secuencia), futuro))
+        self._despachar(carril)
+        try:
+            await asyncio.wait_for(futuro, self.espera_max)
+        except asyncio.TimeoutError:
+            self._retirar(carril, futuro)
+            raise self._rechazar(protocolo)
+        except asyncio.CancelledError:
+            self._retirar(carril, futuro)
+            # El hueco pudo concederse justo antes de la cancelación
+            if futuro.done() and not futuro.cancelled() and futuro.exception() is None:
+                self.liberar(protocolo)
+            raise
+
+    def _retirar(self, carril: _Carril, futuro: asyncio.Future) -> None:
+        for i, entrada in enumerate(carril.cola):
+            if entrada[2] is futuro:
+                carril.cola.pop(i)
+                heapq.heapify(carril.cola)
+                break
+
+    def liberar(self, protocolo: str) -> None:
+        carril = self.carriles[protocolo]
+        carril.en_curso -= 1
+        self._despachar(carril)
+
+    def _despachar(self, carril: _Carril) -> None:
+        while carril.cola and carril.hay_hueco():
+            _, _, futuro = heapq.heappop(carril.cola)
+            if futuro.done():
+                continue
+            carril.en_curso += 1
+            futuro.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, protocolo: str, prioridad: Prioridad = Prioridad.PUNTUAL):
+        await self.adquirir(protocolo, prioridad)
+        try:
+            yield
+        finally:
+            self.liberar(protocolo)
+
+    def registrar_espera_pool(self, segundos: float) -> None:
+        """Ajusta los límites según la espera para obtener una conexión del pool.
+
+        Si la media supera el objetivo se reduce el límite un 10 % (como mucho una vez por
+        intervalo); si no, crece de forma aditiva hasta el máximo configurado.
+        """
+        self.espera_pool = 0.8 * self.espera_pool + 0.2 * segundos
+        saturado = self.espera_pool > self.espera_pool_objetivo
+        if saturado:
+            ahora = time.monotonic()
+            if ahora - self._ultimo_recorte < self.intervalo_recorte:
+                return
+            self._ultimo_recorte = ahora
+        for carril in self.carriles.values():
+            if saturado:
+                carril.limite = max(float(self.limite_min), carril.limite * 0.9)
+            else:
+                carril.limite = min(float(carril.limite_max), carril.limite + 1 / carril.limite)
+                self._despachar(carril)
+
+    def estadisticas(self) -> dict:
+        # Import diferido: deadlines depende de SQLAlchemy y admission no
+        from app.core.deadlines import desconexiones, timeouts
+
+        return {
+            "espera_pool": self.espera_pool,
+            "rechazadas": self.rechazadas,
+            "timeouts": dict(timeouts),
+            "desconexiones": dict(desconexiones),
+            "protocolos": {
+                protocolo: {
+                    "limite": int(carril.limite),
+                    "en_curso": carril.en_curso,
+                    "en_cola": len(carril.cola),
+                }
+                for protocolo, carril in self.carriles.items()
+            },
+        }
+
+
+@lru_cache
+def get_admission() -> AdmissionController:
+    """Controlador compartido por todos los protocolos del proceso."""
+    return AdmissionController.desde_settings()
@@ -1,9 +1,49 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
 
+    # Control de admisión: concurrencia máxima por protocolo antes de encolar
+    ADMISSION_LIMITE_REST: int = 64
+    ADMISSION_LIMITE_GRAPHQL: int = 32
+    ADMISSION_LIMITE_GRPC: int = 64
+    # Peticiones en espera por protocolo y tiempo máximo de espera (segundos)
+    ADMISSION_MAX_COLA: int = 128
+    ADMISSION_ESPERA_MAX: float = 2.0
+    # Espera de conexión del pool a partir de la cual se reducen los límites (segundos)
+    ADMISSION_ESPERA_POOL_OBJETIVO: float = 0.05
+    ADMISSION_RETRY_AFTER: int = 1
+
+    # Presupuesto de tiempo por petición HTTP y tope para RPCs gRPC sin deadline (segundos);
+    # el tiempo restante se aplica como statement_timeout en Postgres
+    PLAZO_HTTP: float = 10.0
+    PLAZO_GRPC_MAX: float = 30.0
+
+    # Snapshot del catálogo en memoria (NumPy) para consultas por precio; intervalo de
+    # recarga y antigüedad máxima aceptada antes de volver a SQL (segundos)
+    CATALOGO_SNAPSHOT: bool = False
+    CATALOGO_REFRESCO: float = 60.0
+    CATALOGO_MAX_ANTIGUEDAD: float = 120.0
+
+    # Sharding horizontal: URLs de los shards separadas por coma (vacío = una sola base).
+    # El orden define el índice de cada shard y no debe cambiar una vez hay datos.
+    SHARD_DATABASE_URLS: str = ""
+
+    @property
+    def shard_urls(self) -> list[str]:
+        return [url.strip() for url in self.SHARD_DATABASE_URLS.split(",") if url.strip()]
+
     class Config:
         env_file = ".env"
 
-settings = Settings()
\ No newline at end of file
+@lru_cache
+def get_settings() -> Settings:
+    """Settings se construye en el primer uso, no al importar (arranque más rápido)."""
+    return Settings()
+
+def __getattr__(nombre: str):
+    # Compatibilidad con `from app.core.config import settings`
+    if nombre == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
@@ -1,12 +1,83 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
-from app.core.config import settings
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from app.core.admission import get_admission
+from app.core.config import get_settings
+from app.core.deadlines import tiempo_restante
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True, future=True)
+# El motor (y el driver asyncpg) se crean en el primer uso, no al importar
+@lru_cache
+def get_engine() -> AsyncEngine:
+    return create_async_engine(get_settings().DATABASE_URL, echo=True, future=True)
+
+@lru_cache
+def get_sessionmaker() -> sessionmaker:
+    return sessionmaker(get_engine(), class_=AsyncSession, expire_on_commit=False)
+
+@event.listens_for(Session, "after_begin")
+def aplicar_statement_timeout(session, transaction, connection):
+    """Limita cada transacción al tiempo que le queda a la petición (solo PostgreSQL)."""
+    restante = tiempo_restante()
+    if restante is None or connection.dialect.name != "postgresql":
+        return
+    # Con el plazo ya vencido se fija 1 ms para que la consulta falle de inmediato
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {max(1, int(restante * 1000))}")
+
+class ShardRouter:
+    """Motores y sesiones de cada shard; un producto vive en el shard `id % número de shards`."""
+
+    def __init__(self, urls: list[str], echo: bool = False):
+        self.urls = urls
+        self.engines = [create_async_engine(url, echo=echo, future=True) for url in urls]
+        self.sessionmakers = [
+            sessionmaker(engine, class_=AsyncSession, expire_on_commit=False) for engine in self.engines
+        ]
+
+    def __len__(self) -> int:
+        return len(self.engines)
+
+    def shard_de(self, producto_id: int) -> int:
+        return producto_id % len(self.engines)
+
+    @asynccontextmanager
+    async def sesion(self, shard: int):
+        async with self.sessionmakers[shard]() as session:
+            await _medir_espera_pool(session)
+            yield session
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+
+@lru_cache
+def get_shard_router() -> ShardRouter | None:
+    """Router de shards si SHARD_DATABASE_URLS está configurado; None en modo de una sola base."""
+    urls = get_settings().shard_urls
+    return ShardRouter(urls) if urls else None
+
+async def _medir_espera_pool(session: AsyncSession) -> None:
+    """Obtiene la conexión de la sesión y reporta al control de admisión cuánto tardó el pool."""
+    inicio = time.perf_counter()
+    await session.connection()
+    get_admission().registrar_espera_pool(time.perf_counter() - inicio)
+
+@asynccontextmanager
+async def abrir_sesion():
+    """Abre una sesión sobre DATABASE_URL midiendo la espera del pool.
+
+    Con shards configurados no se toca la base principal: se entrega None, porque el
+    repositorio particionado abre sus propias sesiones por shard (y mide esas esperas).
+    """
+    if get_shard_router() is not None:
+        yield None
+        return
+    async with get_sessionmaker()() as session:
+        await _medir_espera_pool(session)
+        yield session
 
 async def get_session() -> AsyncSession:
-    async_session = sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False
-    )
-    async with async_session() as session:
-        yield session
\ No newline at end of file
+    async with abrir_sesion() as session:
+        yield session
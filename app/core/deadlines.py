@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from contextlib import suppress
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+# Instante (time.monotonic) en que vence la petición en curso; None = sin plazo
+deadline_actual: ContextVar[Optional[float]] = ContextVar("deadline_actual", default=None)
+
+# Peticiones abandonadas por protocolo
+timeouts: Counter = Counter()
+desconexiones: Counter = Counter()
+
+# SQLSTATE de Postgres para una consulta cancelada (statement_timeout o cancelación)
+_QUERY_CANCELED = "57014"
+
+
+def tiempo_restante() -> Optional[float]:
+    deadline = deadline_actual.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def es_timeout(exc: BaseException) -> bool:
+    """Indica si la excepción corresponde a un plazo agotado (local o statement_timeout)."""
+    if isinstance(exc, asyncio.TimeoutError):
+        return True
+    if isinstance(exc, DBAPIError):
+        orig = exc.orig
+        codigo = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+        return codigo == _QUERY_CANCELED
+    return False
+
+
+def registrar_timeout(protocolo: str) -> None:
+    timeouts[protocolo] += 1
+    logger.warning("Plazo agotado en petición %s (total %d)", protocolo, timeouts[protocolo])
+
+
+def protocolo_http(scope) -> str:
+    """Protocolo con el que se contabiliza una petición HTTP (REST o GraphQL)."""
+    return "graphql" if scope.get("path", "").startswith("/graphql") else "rest"
+
+
+class PlazoMiddleware:
+    """Middleware ASGI que acota cada petición HTTP a un presupuesto de tiempo.
+
+    El plazo se publica en `deadline_actual` para que la sesión lo aplique como
+    `statement_timeout`. Si el cliente se desconecta, o el plazo vence, se cancela el
+    handler (y con él la consulta asyncpg en curso); un plazo vencido responde 504.
+    """
+
+    def __init__(self, app, presupuesto: float):
+        self.app = app
+        self.presupuesto = presupuesto
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Se lee el cuerpo antes de lanzar el handler para poder vigilar `receive` en paralelo
+        cuerpo = []
+        while True:
+            mensaje = await receive()
+            if mensaje["type"] == "http.disconnect":
+                return
+            cuerpo.append(mensaje)
+            if not mensaje.get("more_body", False):
+                break
+
+        desconectado = asyncio.Event()
+
+        async def receive_app():
+            if cuerpo:
+                return cuerpo.pop(0)
+            await desconectado.wait()
+            return {"type": "http.disconnect"}
+
+        respuesta_iniciada = False
+
+        async def send_app(mensaje):
+            nonlocal respuesta_iniciada
+            if mensaje["type"] == "http.response.start":
+                respuesta_iniciada = True
+            await send(mensaje)
+
+        async def vigilar_desconexion():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            desconectado.set()
+
+        token = deadline_actual.set(time.monotonic() + self.presupuesto)
+        try:
+            handler = asyncio.create_task(self.app(scope, receive_app, send_app))
+        finally:
+            deadline_actual.reset(token)
+        vigia = asyncio.create_task(vigilar_desconexion())
+
+        try:
+            hechas, _ = await asyncio.wait(
+                {handler, vigia}, timeout=self.presupuesto, return_when=asyncio.FIRST_COMPLETED
+            )
+            if handler in hechas:
+                handler.result()
+                return
+
+            handler.cancel()
+            with suppress(asyncio.CancelledError):
+                await handler
+            if vigia in hechas:
+                desconexiones[protocolo_http(scope)] += 1
+                logger.info("Cliente desconectado, petición cancelada: %s", scope.get("path"))
+                return
+            raise asyncio.TimeoutError()
+        except Exception as exc:
+            if not es_timeout(exc) or respuesta_iniciada:
+                raise
+            registrar_timeout(protocolo_http(scope))
+            await send({
+                "type": "http.response.start",
+                "status": 504,
+                "headers": [(b"content-type", b"application/json")],
+            })
+            await send({"type": "http.response.body", "body": b'{"detail":"Tiempo de espera agotado"}'})
+        finally:
+            vigia.cancel()
+            if not handler.done():
+                handler.cancel()
@@ -0,0 +1,4 @@
+# Punto de entrada solo GraphQL: uvicorn app.entrypoints.graphql:app
+from app.entrypoints.http import crear_app
+
+app = crear_app(rest=False, graphql=True)
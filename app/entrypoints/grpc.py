@@ -0,0 +1,11 @@
+# Punto de entrada solo gRPC: python -m app.entrypoints.grpc
+import asyncio
+import logging
+from app.grpc.server import serve
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
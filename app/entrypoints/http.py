@@ -0,0 +1,62 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from app.core.config import get_settings
+from app.core.deadlines import PlazoMiddleware
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    refresco = None
+    if settings.CATALOGO_SNAPSHOT and settings.shard_urls:
+        # El repositorio particionado consulta los shards directamente
+        logger.warning("CATALOGO_SNAPSHOT se ignora con SHARD_DATABASE_URLS configurado")
+    elif settings.CATALOGO_SNAPSHOT:
+        # Import diferido: NumPy solo se carga si el snapshot está activado
+        from app.core.database import abrir_sesion
+        from app.repositories.catalogo_snapshot import CatalogoSnapshot, refrescar_periodicamente
+        from app.repositories.producto_repository import ProductoRepository
+
+        snapshot = CatalogoSnapshot()
+        async with abrir_sesion() as session:
+            await snapshot.cargar(session)
+        ProductoRepository.snapshot = snapshot
+        ProductoRepository.snapshot_max_antiguedad = settings.CATALOGO_MAX_ANTIGUEDAD
+        refresco = asyncio.create_task(
+            refrescar_periodicamente(snapshot, abrir_sesion, settings.CATALOGO_REFRESCO)
+        )
+    yield
+    if refresco:
+        refresco.cancel()
+        ProductoRepository.snapshot = None
+
+def root():
+    return {"message": "API is running"}
+
+def estadisticas():
+    """Estado del control de admisión y peticiones abandonadas (plazo vencido o desconexión)."""
+    from app.core.admission import get_admission
+    return get_admission().estadisticas()
+
+def crear_app(rest: bool = True, graphql: bool = True) -> FastAPI:
+    """Construye la aplicación HTTP importando solo los protocolos que sirve."""
+    app = FastAPI(title="Scalable CRUD API", lifespan=lifespan if rest else None)
+
+    # Presupuesto por petición y cancelación del handler si el cliente se desconecta
+    app.add_middleware(PlazoMiddleware, presupuesto=get_settings().PLAZO_HTTP)
+
+    if rest:
+        from app.api.v1.endpoints import items
+        app.include_router(items.router, prefix="/api/v1/items", tags=["items"])
+
+    if graphql:
+        # El esquema GraphQL se construye en la primera petición a /graphql
+        from app.graphql.app import GraphQLPerezoso
+        app.add_route("/graphql", GraphQLPerezoso("/graphql"), include_in_schema=False)
+
+    app.add_api_route("/", root, methods=["GET"])
+    app.add_api_route("/estadisticas", estadisticas, methods=["GET"], include_in_schema=False)
+    return app
@@ -0,0 +1,4 @@
+# Punto de entrada solo REST: uvicorn app.entrypoints.rest:app
+from app.entrypoints.http import crear_app
+
+app = crear_app(rest=True, graphql=False)
@@ -0,0 +1,94 @@
+from typing import Optional
+from fastapi import Depends, Request
+from app.api.deps import reserva
+from app.core.admission import Prioridad
+from app.core.database import get_session
+
+# Prioridad de admisión de cada campo raíz; los no listados (introspección) cuentan como listado
+PRIORIDAD_CAMPOS = {
+    "getProducto": Prioridad.PUNTUAL,
+    "getProductos": Prioridad.LISTADO,
+    "createProducto": Prioridad.PUNTUAL,
+    "updateProducto": Prioridad.PUNTUAL,
+    "deleteProducto": Prioridad.PUNTUAL,
+    "repriceProductos": Prioridad.MASIVA,
+}
+
+
+def clasificar_operacion(consulta: Optional[str], operacion: Optional[str] = None) -> Prioridad:
+    """Prioridad de una operación GraphQL: la del campo raíz de menor prioridad que seleccione.
+
+    Una consulta ilegible se admite como listado; Strawberry devolverá el error de sintaxis.
+    """
+    # Import diferido: graphql-core ya está cargado cuando se sirve /graphql
+    from graphql import FieldNode, GraphQLError, OperationDefinitionNode, parse
+
+    if not consulta:
+        return Prioridad.LISTADO
+    try:
+        documento = parse(consulta)
+    except GraphQLError:
+        return Prioridad.LISTADO
+    prioridades = [
+        PRIORIDAD_CAMPOS.get(seleccion.name.value, Prioridad.LISTADO) if isinstance(seleccion, FieldNode)
+        else Prioridad.LISTADO  # fragmentos en la raíz
+        for definicion in documento.definitions
+        if isinstance(definicion, OperationDefinitionNode)
+        and (operacion is None or definicion.name is None or definicion.name.value == operacion)
+        for seleccion in definicion.selection_set.selections
+    ]
+    return max(prioridades, default=Prioridad.LISTADO)
+
+
+async def prioridad_operacion(request: Request) -> Prioridad:
+    if request.method == "GET":
+        return clasificar_operacion(request.query_params.get("query"), request.query_params.get("operationName"))
+    if request.headers.get("content-type", "").split(";")[0].strip() != "application/json":
+        return Prioridad.LISTADO
+    try:
+        cuerpo = await request.json()
+    except ValueError:
+        return Prioridad.LISTADO
+    if not isinstance(cuerpo, dict):
+        return Prioridad.LISTADO
+    return clasificar_operacion(cuerpo.get("query"), cuerpo.get("operationName"))
+
+
+async def admitir_operacion(prioridad: Prioridad = Depends(prioridad_operacion)):
+    async with reserva(prioridad, "graphql"):
+        yield
+
+
+# Configuración del contexto para inyectar la sesión de DB.
+# La admisión se resuelve antes que la sesión para no ocupar el pool si se rechaza.
+async def get_context(
+    _=Depends(admitir_operacion),
+    session=Depends(get_session),
+):
+    return {"session": session}
+
+
+class GraphQLPerezoso:
+    """Aplicación ASGI que importa Strawberry y construye el esquema en la primera petición.
+
+    Así los procesos que no sirven GraphQL (o que aún no lo han recibido) no pagan el
+    import de Strawberry ni la construcción del esquema al arrancar. Se monta como ruta de la
+    aplicación FastAPI de `crear_app`, que aporta el scope que espera el router.
+    """
+
+    def __init__(self, ruta: str = "/graphql"):
+        self.ruta = ruta
+        self._app = None
+
+    def construir(self):
+        if self._app is None:
+            from strawberry.fastapi import GraphQLRouter
+            from app.graphql.schema import schema
+
+            # El router se sirve tal cual, sin una segunda FastAPI: su ServerErrorMiddleware
+            # respondería 500 a un plazo agotado antes de que PlazoMiddleware pudiera dar 504
+            self._app = GraphQLRouter(schema, path=self.ruta, context_getter=get_context)
+        return self._app
+
+    async def __call__(self, scope, receive, send):
+        await self.construir()(scope, receive, send)
@@ -2,9 +2,10 @@ import strawberry
 from typing import List, Optional
 from strawberry.types import Info
 
-from app.models.item import Producto, ProductoCreate, ProductoUpdate
+from app.core.deadlines import es_timeout
+from app.models.item import Producto, ProductoCreate, ProductoReprice, ProductoUpdate
 from app.repositories.producto_repository import ProductoRepository
-from app.graphql.types import ProductoType
+from app.graphql.types import ProductoRepriceResultType, ProductoType, producto_desde_fila
 
 @strawberry.type
 class Query:
@@ -12,16 +13,16 @@ class Query:
     async def get_productos(self, info: Info) -> List[ProductoType]:
         session = info.context["session"]
         repo = ProductoRepository(session)
-        productos = await repo.get_all()
-        return [ProductoType.from_pydantic(p) for p in productos]
+        filas = await repo.get_all_filas()
+        return [producto_desde_fila(f) for f in filas]
 
     @strawberry.field
     async def get_producto(self, info: Info, id: int) -> Optional[ProductoType]:
         session = info.context["session"]
         repo = ProductoRepository(session)
-        producto = await repo.get_by_id(id)
-        if producto:
-            return ProductoType.from_pydantic(producto)
+        fila = await repo.get_by_id_fila(id)
+        if fila:
+            return producto_desde_fila(fila)
         return None
 
 @strawberry.type
@@ -43,7 +44,7 @@ class Mutation:
             descripcion=descripcion
         )
         nuevo_producto = await repo.create(producto_in)
-        return ProductoType.from_pydantic(nuevo_producto)
+        return producto_desde_fila(nuevo_producto)
 
     @strawberry.mutation
     async def update_producto(
@@ -72,7 +73,7 @@ class Mutation:
         
         updated = await repo.update(id, producto_data)
         if updated:
-            return ProductoType.from_pydantic(updated)
+            return producto_desde_fila(updated)
         return None
 
     @strawberry.mutation
@@ -81,4 +82,49 @@ class Mutation:
         repo = ProductoRepository(session)
         return await repo.delete(id)
 
-schema = strawberry.Schema(query=Query, mutation=Mutation)
\ No newline at end of file
+    @strawberry.mutation
+    async def reprice_productos(
+        self,
+        info: Info,
+        porcentaje: Optional[float] = None,
+        absoluto: Optional[float] = None,
+        precio_min: Optional[float] = None,
+        precio_max: Optional[float] = None,
+        redondeo: Optional[int] = 2,
+        dry_run: bool = False,
+        tamano_lote: Optional[int] = None,
+        desde_id: Optional[int] = None
+    ) -> ProductoRepriceResultType:
+        session = info.context["session"]
+        repo = ProductoRepository(session)
+
+        datos = ProductoReprice(
+            porcentaje=porcentaje,
+            absoluto=absoluto,
+            precio_min=precio_min,
+            precio_max=precio_max,
+            redondeo=redondeo,
+            dry_run=dry_run,
+            tamano_lote=tamano_lote,
+            desde_id=desde_id
+        )
+        resultado = await repo.reprice(datos)
+        return ProductoRepriceResultType.from_pydantic(resultado)
+
+
+class Schema(strawberry.Schema):
+    """Esquema que deja escapar los plazos agotados en lugar de devolverlos en `errors`.
+
+    Strawberry convierte cualquier excepción de un resolver en un error GraphQL y responde
+    200 con su texto (incluida la SQL). Relanzándolos aquí, `PlazoMiddleware` responde 504
+    y los contabiliza como el resto de protocolos.
+    """
+
+    def process_errors(self, errors, execution_context=None):
+        for error in errors:
+            if es_timeout(error.original_error):
+                raise error.original_error
+        super().process_errors(errors, execution_context)
+
+
+schema = Schema(query=Query, mutation=Mutation)
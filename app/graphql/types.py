@@ -1,6 +1,6 @@
 import strawberry
 from typing import Optional
-from app.models.item import Producto # Asegúrate de que el nombre del archivo sea correcto
+from app.models.item import Producto, ProductoRepriceResult # Asegúrate de que el nombre del archivo sea correcto
 
 @strawberry.experimental.pydantic.type(model=Producto, all_fields=True)
 class ProductoType:
@@ -8,4 +8,14 @@ class ProductoType:
     Representación de GraphQL del modelo Producto.
     'all_fields=True' mapea automáticamente id, nombre, descripcion y precio. 
     """
-    pass
\ No newline at end of file
+    pass
+
+
+def producto_desde_fila(p) -> ProductoType:
+    """Construye el tipo GraphQL directamente desde una fila o entidad, sin copia intermedia Pydantic."""
+    return ProductoType(id=p.id, nombre=p.nombre, descripcion=p.descripcion, precio=p.precio)
+
+@strawberry.experimental.pydantic.type(model=ProductoRepriceResult, all_fields=True)
+class ProductoRepriceResultType:
+    """Resultado de un reprecio masivo: filas afectadas (o que se verían afectadas en dry_run)."""
+    pass
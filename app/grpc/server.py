@@ -1,8 +1,10 @@
 import asyncio
+import functools
 import logging
+import time
+from typing import Sequence
 import grpc
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import Row
 
 # Importaciones de los archivos generados por protoc
 
@@ -10,18 +12,111 @@ import app.grpc.producto_pb2 as pb2
 import app.grpc.producto_pb2_grpc as pb2_grpc
 
 # Importaciones de tu lógica de negocio
-from app.repositories.producto_repository import ProductoRepository
-from app.core.database import engine
-from app.models.item import ProductoCreate, ProductoUpdate
+from app.repositories.producto_repository import CAMPOS_PRODUCTO, ProductoRepository, resolver_campos
+from app.core.admission import Prioridad, SobrecargaError, get_admission
+from app.core.config import get_settings
+from app.core.database import abrir_sesion
+from app.core.deadlines import deadline_actual, desconexiones, es_timeout, registrar_timeout
+from pydantic import ValidationError
+from app.models.item import ProductoCreate, ProductoReprice, ProductoUpdate
 
-# Configuración de sesión local
-SessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+def admitido(prioridad: Prioridad):
+    """Reserva un hueco de admisión para el RPC o lo rechaza con RESOURCE_EXHAUSTED."""
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        async def envoltura(self, request, context):
+            admission = get_admission()
+            try:
+                await admission.adquirir("grpc", prioridad)
+            except SobrecargaError as e:
+                context.set_trailing_metadata((("retry-after", str(e.retry_after)),))
+                await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "Servidor saturado, reintente más tarde")
+            try:
+                return await metodo(self, request, context)
+            finally:
+                admission.liberar("grpc")
+        return envoltura
+    return decorador
+
+
+def con_plazo(metodo):
+    """Propaga el deadline del cliente a la sesión y cancela el RPC si vence o se abandona."""
+    @functools.wraps(metodo)
+    async def envoltura(self, request, context):
+        plazo_max = get_settings().PLAZO_GRPC_MAX
+        restante = context.time_remaining()
+        if restante is None or restante > plazo_max:
+            restante = plazo_max
+
+        fin = time.monotonic() + restante
+
+        def plazo_vencido() -> bool:
+            queda = context.time_remaining()
+            return time.monotonic() >= fin or (queda is not None and queda <= 0)
+
+        # Si el cliente cancela la llamada se cancela la tarea y su consulta en curso; si lo
+        # que ha vencido es el deadline no es una desconexión, lo cuenta el except de abajo
+        tarea = asyncio.current_task()
+
+        def al_terminar(ctx):
+            if ctx.cancelled() and not tarea.done():
+                if not plazo_vencido():
+                    desconexiones["grpc"] += 1
+                tarea.cancel()
+
+        context.add_done_callback(al_terminar)
+
+        token = deadline_actual.set(fin)
+        try:
+            return await asyncio.wait_for(metodo(self, request, context), restante)
+        except asyncio.CancelledError:
+            # grpc.aio cancela el handler al vencer el deadline del cliente, a veces antes
+            # de que salte el wait_for
+            if plazo_vencido():
+                registrar_timeout("grpc")
+            raise
+        except Exception as e:
+            if not es_timeout(e):
+                raise
+            registrar_timeout("grpc")
+            await context.abort(grpc.StatusCode.DEADLINE_EXCEEDED, "Tiempo de espera agotado")
+        finally:
+            deadline_actual.reset(token)
+    return envoltura
+
+
+def a_respuesta(p) -> pb2.ProductoResponse:
+    """Convierte un producto a mensaje protobuf.
+
+    Acepta entidades ORM y filas de solo lectura; con filas parciales (FieldMask) solo se
+    asignan las columnas consultadas y el resto no se serializa.
+    """
+    if isinstance(p, Row) and p._fields != CAMPOS_PRODUCTO:
+        return pb2.ProductoResponse(**{k: v for k, v in zip(p._fields, p) if v is not None})
+    return pb2.ProductoResponse(id=p.id, nombre=p.nombre, descripcion=p.descripcion or "", precio=p.precio)
+
+
+def a_lista(filas: Sequence[Row]) -> pb2.ProductoListResponse:
+    """Construye el listado sobre el propio campo repetido (`add`), sin mensajes intermedios."""
+    respuesta = pb2.ProductoListResponse()
+    agregar = respuesta.productos.add
+    if filas and filas[0]._fields != CAMPOS_PRODUCTO:
+        claves = filas[0]._fields
+        for fila in filas:
+            agregar(**{k: v for k, v in zip(claves, fila) if v is not None})
+        return respuesta
+    for id_, nombre, descripcion, precio in filas:
+        agregar(id=id_, nombre=nombre, descripcion=descripcion or "", precio=precio)
+    return respuesta
 
 class ProductoServicer(pb2_grpc.ProductoServiceServicer):
     """Implementación de los servicios CRUD definidos en el archivo .proto"""
 
+    @admitido(Prioridad.PUNTUAL)
+    @con_plazo
     async def CreateProducto(self, request, context):
-        async with SessionLocal() as session:
+        async with abrir_sesion() as session:
             repo = ProductoRepository(session)
             try:
                 p_in = ProductoCreate(
@@ -30,46 +125,46 @@ class ProductoServicer(pb2_grpc.ProductoServiceServicer):
                     descripcion=request.descripcion
                 )
                 p = await repo.create(p_in)
-                return pb2.ProductoResponse(
-                    id=p.id,
-                    nombre=p.nombre,
-                    descripcion=p.descripcion or "",
-                    precio=p.precio
-                )
+                return a_respuesta(p)
             except Exception as e:
-                context.abort(grpc.StatusCode.INTERNAL, f"Error al crear producto: {str(e)}")
+                # El statement_timeout debe llegar a con_plazo como DEADLINE_EXCEEDED
+                if es_timeout(e):
+                    raise
+                await context.abort(grpc.StatusCode.INTERNAL, f"Error al crear producto: {str(e)}")
 
+    @admitido(Prioridad.PUNTUAL)
+    @con_plazo
     async def GetProducto(self, request, context):
-        async with SessionLocal() as session:
+        try:
+            campos = resolver_campos(request.field_mask.paths)
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+        async with abrir_sesion() as session:
             repo = ProductoRepository(session)
-            p = await repo.get_by_id(request.id)
-            if not p:
-                context.abort(grpc.StatusCode.NOT_FOUND, f"Producto con ID {request.id} no encontrado")
+            fila = await repo.get_by_id_fila(request.id, campos)
+            if not fila:
+                await context.abort(grpc.StatusCode.NOT_FOUND, f"Producto con ID {request.id} no encontrado")
             
-            return pb2.ProductoResponse(
-                id=p.id,
-                nombre=p.nombre,
-                descripcion=p.descripcion or "",
-                precio=p.precio
-            )
+            return a_respuesta(fila)
 
+    @admitido(Prioridad.LISTADO)
+    @con_plazo
     async def GetAllProductos(self, request, context):
-        async with SessionLocal() as session:
+        try:
+            campos = resolver_campos(request.field_mask.paths)
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+        async with abrir_sesion() as session:
             repo = ProductoRepository(session)
-            productos = await repo.get_all()
-            
-            responses = [
-                pb2.ProductoResponse(
-                    id=p.id,
-                    nombre=p.nombre,
-                    descripcion=p.descripcion or "",
-                    precio=p.precio
-                ) for p in productos
-            ]
-            return pb2.ProductoListResponse(productos=responses)
+            filas = await repo.get_all_filas(campos)
+            return a_lista(filas)
 
+    @admitido(Prioridad.PUNTUAL)
+    @con_plazo
     async def UpdateProducto(self, request, context):
-        async with SessionLocal() as session:
+        async with abrir_sesion() as session:
             repo = ProductoRepository(session)
             p_update = ProductoUpdate(
                 nombre=request.nombre if request.nombre else None,
@@ -79,26 +174,50 @@ class ProductoServicer(pb2_grpc.ProductoServiceServicer):
             
             updated_p = await repo.update(request.id, p_update)
             if not updated_p:
-                context.abort(grpc.StatusCode.NOT_FOUND, f"No se pudo actualizar: Producto {request.id} no existe")
+                await context.abort(grpc.StatusCode.NOT_FOUND, f"No se pudo actualizar: Producto {request.id} no existe")
             
-            return pb2.ProductoResponse(
-                id=updated_p.id,
-                nombre=updated_p.nombre,
-                descripcion=updated_p.descripcion or "",
-                precio=updated_p.precio
-            )
+            return a_respuesta(updated_p)
 
+    @admitido(Prioridad.PUNTUAL)
+    @con_plazo
     async def DeleteProducto(self, request, context):
-        async with SessionLocal() as session:
+        async with abrir_sesion() as session:
             repo = ProductoRepository(session)
             success = await repo.delete(request.id)
             if not success:
-                context.abort(grpc.StatusCode.NOT_FOUND, f"No se pudo eliminar: Producto {request.id} no existe")
+                await context.abort(grpc.StatusCode.NOT_FOUND, f"No se pudo eliminar: Producto {request.id} no existe")
             
             return pb2.DeleteResponse(success=True)
 
+    @admitido(Prioridad.MASIVA)
+    @con_plazo
+    async def RepriceProductos(self, request, context):
+        opcionales = ("precio_min", "precio_max", "porcentaje", "absoluto", "redondeo", "desde_id")
+        try:
+            datos = ProductoReprice(
+                **{campo: getattr(request, campo) for campo in opcionales if request.HasField(campo)},
+                dry_run=request.dry_run,
+                tamano_lote=request.tamano_lote or None
+            )
+        except ValidationError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+        async with abrir_sesion() as session:
+            repo = ProductoRepository(session)
+            resultado = await repo.reprice(datos)
+            return pb2.RepriceResponse(
+                afectados=resultado.afectados,
+                dry_run=resultado.dry_run,
+                completo=resultado.completo,
+                ultimo_id=resultado.ultimo_id
+            )
+
 async def serve():
-    server = grpc.aio.server()
+    # Tope duro por encima del control de admisión (límite + cola): gRPC rechaza el resto
+    settings = get_settings()
+    server = grpc.aio.server(
+        maximum_concurrent_rpcs=settings.ADMISSION_LIMITE_GRPC + settings.ADMISSION_MAX_COLA
+    )
     pb2_grpc.add_ProductoServiceServicer_to_server(ProductoServicer(), server)
     
     # Puerto estandar para gRPC definido en la arquitectura
@@ -1,4 +1,5 @@
 from typing import Optional
+from pydantic import model_validator
 from sqlmodel import Field, SQLModel
 
 # Clase base con los atributos requeridos 
@@ -19,4 +20,41 @@ class ProductoCreate(ProductoBase):
 class ProductoUpdate(SQLModel):
     nombre: Optional[str] = None
     descripcion: Optional[str] = None
-    precio: Optional[float] = None
\ No newline at end of file
+    precio: Optional[float] = None
+
+# Esquema de respuesta para fieldsets parciales (?fields= / FieldMask):
+# los campos no pedidos quedan sin asignar y se omiten al serializar
+class ProductoParcial(SQLModel):
+    id: Optional[int] = None
+    nombre: Optional[str] = None
+    descripcion: Optional[str] = None
+    precio: Optional[float] = None
+
+
+# Reprecio masivo: filtro por rango de precio [precio_min, precio_max) y un único ajuste
+class ProductoReprice(SQLModel):
+    precio_min: Optional[float] = None
+    precio_max: Optional[float] = None
+    porcentaje: Optional[float] = Field(default=None, gt=-100)
+    absoluto: Optional[float] = None
+    # Decimales del precio resultante (None = sin redondeo)
+    redondeo: Optional[int] = Field(default=2, ge=0)
+    dry_run: bool = False
+    # Si se indica, se actualiza por rangos de id de este tamaño (una transacción por lote)
+    tamano_lote: Optional[int] = Field(default=None, gt=0)
+    # Solo productos con id >= desde_id: para reanudar un reprecio por lotes incompleto
+    desde_id: Optional[int] = Field(default=None, ge=0)
+
+    @model_validator(mode="after")
+    def un_solo_ajuste(self):
+        if (self.porcentaje is None) == (self.absoluto is None):
+            raise ValueError("Indique 'porcentaje' o 'absoluto' (solo uno)")
+        return self
+
+class ProductoRepriceResult(SQLModel):
+    afectados: int
+    dry_run: bool
+    # Por lotes: False si se detuvo antes de agotar el plazo de la petición; se reanuda
+    # con desde_id = ultimo_id + 1 sin volver a aplicar el ajuste a lo ya confirmado
+    completo: bool = True
+    ultimo_id: Optional[int] = None
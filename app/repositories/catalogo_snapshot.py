@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import math
+import time
+from typing import NamedTuple, Optional
+
+import numpy as np
+from sqlmodel import select
+
+from app.models.item import Producto
+
+logger = logging.getLogger(__name__)
+
+
+class PrecioFila(NamedTuple):
+    """Fila de solo lectura devuelta por las consultas por precio."""
+    id: int
+    nombre: str
+    precio: float
+
+
+class CatalogoSnapshot:
+    """Modelo de lectura en memoria para consultas por precio (rangos, top-N, percentiles).
+
+    Guarda `id` y `precio` en arrays NumPy ordenados por precio y los nombres en una tabla
+    auxiliar por id. Se carga completo desde la base de datos y se mantiene al día con las
+    escrituras que pasan por `ProductoRepository` en este proceso; las de otros procesos
+    solo se ven en la siguiente recarga, por eso `antiguedad()` mide el tiempo desde la
+    última carga completa y los llamadores vuelven a SQL si supera su tolerancia.
+    """
+
+    def __init__(self):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.precios = np.empty(0, dtype=np.float64)
+        self.nombres: dict[int, str] = {}
+        self.cargado_en: Optional[float] = None
+        # Escrituras recibidas mientras una carga espera a la base de datos (None = sin carga)
+        self._pendientes: Optional[list[tuple[int, Optional[str], Optional[float]]]] = None
+        self._invalidado_en_carga = False
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    async def cargar(self, session) -> None:
+        """Recarga el snapshot completo.
+
+        Las escrituras que llegan mientras se espera el SELECT pueden no estar en su resultado:
+        se guardan y se reaplican sobre los datos nuevos (son idempotentes). Si durante la carga
+        se invalidó el snapshot (reprecio masivo), se cargan los datos pero no se marca fresco.
+        """
+        self._pendientes = []
+        self._invalidado_en_carga = False
+        try:
+            result = await session.execute(
+                select(Producto.id, Producto.nombre, Producto.precio).order_by(Producto.precio, Producto.id)
+            )
+            filas = result.all()
+        finally:
+            pendientes, self._pendientes = self._pendientes, None
+        # Se reemplazan los arrays completos: las lecturas en curso conservan la versión anterior
+        self.ids = np.fromiter((f[0] for f in filas), dtype=np.int64, count=len(filas))
+        self.precios = np.fromiter((f[2] for f in filas), dtype=np.float64, count=len(filas))
+        self.nombres = {f[0]: f[1] for f in filas}
+        for producto_id, nombre, precio in pendientes:
+            if precio is None:
+                self.aplicar_baja(producto_id)
+            else:
+                self.aplicar(producto_id, nombre, precio)
+        self.cargado_en = None if self._invalidado_en_carga else time.monotonic()
+
+    def antiguedad(self) -> Optional[float]:
+        """Segundos desde la última carga completa; None si no está cargado o se invalidó."""
+        if self.cargado_en is None:
+            return None
+        return time.monotonic() - self.cargado_en
+
+    def es_fresco(self, max_antiguedad: float) -> bool:
+        antiguedad = self.antiguedad()
+        return antiguedad is not None and antiguedad <= max_antiguedad
+
+    def invalidar(self) -> None:
+        """Marca el snapshot como no utilizable hasta la próxima carga (p. ej. tras un reprecio)."""
+        self.cargado_en = None
+        if self._pendientes is not None:
+            self._invalidado_en_carga = True
+
+    # --- Escrituras incrementales ---
+
+    def aplicar(self, producto_id: int, nombre: str, precio: float) -> None:
+        """Inserta o actualiza un producto manteniendo el orden por precio."""
+        if self._pendientes is not None:
+            self._pendientes.append((producto_id, nombre, precio))
+        if producto_id in self.nombres:
+            self._quitar(producto_id)
+        posicion = int(np.searchsorted(self.precios, precio, side="right"))
+        self.precios = np.insert(self.precios, posicion, precio)
+        self.ids = np.insert(self.ids, posicion, producto_id)
+        self.nombres[producto_id] = nombre
+
+    def aplicar_baja(self, producto_id: int) -> None:
+        if self._pendientes is not None:
+            self._pendientes.append((producto_id, None, None))
+        if producto_id in self.nombres:
+            self._quitar(producto_id)
+            del self.nombres[producto_id]
+
+    def _quitar(self, producto_id: int) -> None:
+        posiciones = np.flatnonzero(self.ids == producto_id)
+        self.precios = np.delete(self.precios, posiciones)
+        self.ids = np.delete(self.ids, posiciones)
+
+    # --- Consultas ---
+
+    def _filas(self, ids: np.ndarray, precios: np.ndarray) -> list[PrecioFila]:
+        nombres = self.nombres
+        return [PrecioFila(i, nombres[i], p) for i, p in zip(ids.tolist(), precios.tolist())]
+
+    def rango(
+        self,
+        precio_min: Optional[float] = None,
+        precio_max: Optional[float] = None,
+        limite: Optional[int] = None,
+        descendente: bool = False,
+    ) -> list[PrecioFila]:
+        """Productos con precio en [precio_min, precio_max), ordenados por precio."""
+        ids, precios = self.ids, self.precios
+        desde = 0 if precio_min is None else int(np.searchsorted(precios, precio_min, side="left"))
+        hasta = len(precios) if precio_max is None else int(np.searchsorted(precios, precio_max, side="left"))
+        if descendente:
+            inicio = hasta if limite is None else max(desde, hasta - limite)
+            return self._filas(ids[inicio:hasta][::-1], precios[inicio:hasta][::-1])
+        fin = hasta if limite is None else min(hasta, desde + limite)
+        return self._filas(ids[desde:fin], precios[desde:fin])
+
+    def percentil(self, q: float) -> Optional[float]:
+        """Percentil de precio por rango más cercano (q entre 0 y 1)."""
+        precios = self.precios
+        if not len(precios):
+            return None
+        return float(precios[max(0, math.ceil(q * len(precios)) - 1)])
+
+
+async def refrescar_periodicamente(snapshot: CatalogoSnapshot, abrir_sesion, intervalo: float) -> None:
+    """Recarga el snapshot cada `intervalo` segundos para incorporar escrituras de otros procesos."""
+    while True:
+        await asyncio.sleep(intervalo)
+        try:
+            async with abrir_sesion() as session:
+                await snapshot.cargar(session)
+            logger.info("Catálogo en memoria recargado: %d productos", len(snapshot))
+        except Exception:
+            logger.exception("No se pudo recargar el catálogo en memoria")
@@ -1,8 +1,60 @@
+import math
+import time
+from typing import TYPE_CHECKING, Awaitable, Callable, Iterable, Optional, Sequence
 from sqlmodel import select
+from sqlalchemy import Float, Numeric, Row, cast, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.item import Producto, ProductoCreate, ProductoUpdate 
+from app.core.database import get_shard_router
+from app.core.deadlines import tiempo_restante
+from app.models.item import (
+    Producto,
+    ProductoCreate,
+    ProductoReprice,
+    ProductoRepriceResult,
+    ProductoUpdate,
+)
+
+if TYPE_CHECKING:
+    from app.repositories.catalogo_snapshot import CatalogoSnapshot
+
+# Columnas que pueden pedirse en un fieldset parcial (REST ?fields= / gRPC FieldMask)
+CAMPOS_PRODUCTO = ("id", "nombre", "descripcion", "precio")
+
+
+def resolver_campos(campos: Optional[Iterable[str]]) -> Optional[tuple[str, ...]]:
+    """Normaliza un fieldset: valida nombres, elimina duplicados e incluye siempre el id.
+
+    Devuelve None si no se pidió ningún campo (se cargan todas las columnas).
+    """
+    if campos is None:
+        return None
+    pedidos = {c.strip() for c in campos if c and c.strip()}
+    if not pedidos:
+        return None
+    desconocidos = pedidos.difference(CAMPOS_PRODUCTO)
+    if desconocidos:
+        raise ValueError(f"Campos desconocidos: {', '.join(sorted(desconocidos))}")
+    pedidos.add("id")
+    # Se respeta el orden de declaración de las columnas
+    return tuple(c for c in CAMPOS_PRODUCTO if c in pedidos)
+
 
 class ProductoRepository:
+    # Modelo de lectura en memoria opcional (CATALOGO_SNAPSHOT); se asigna al arrancar la app
+    snapshot: Optional["CatalogoSnapshot"] = None
+    # Antigüedad máxima (s) del snapshot para responder desde memoria en vez de SQL
+    snapshot_max_antiguedad: float = 120.0
+
+    def __new__(cls, session: AsyncSession):
+        # Con SHARD_DATABASE_URLS configurado las capas REST/GraphQL/gRPC reciben el
+        # repositorio particionado sin cambios; la sesión recibida no se usa en ese modo
+        if cls is ProductoRepository:
+            router = get_shard_router()
+            if router is not None:
+                from app.repositories.sharding import ShardedProductoRepository
+                return ShardedProductoRepository(router)
+        return super().__new__(cls)
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
@@ -11,15 +63,38 @@ class ProductoRepository:
         self.session.add(db_producto)
         await self.session.commit()
         await self.session.refresh(db_producto)
+        if self.snapshot is not None:
+            self.snapshot.aplicar(db_producto.id, db_producto.nombre, db_producto.precio)
         return db_producto
 
     async def get_all(self) -> list[Producto]:
         result = await self.session.execute(select(Producto))
         return result.scalars().all()
 
+    async def get_all_filas(self, campos: Optional[Iterable[str]] = None) -> Sequence[Row]:
+        """Listado de solo lectura: filas ligeras (tuplas con acceso por atributo) sin pasar por el ORM.
+
+        No crea entidades ni las registra en el identity map de la sesión. Con `campos` el
+        SELECT se restringe a esas columnas.
+        """
+        columnas = resolver_campos(campos) or CAMPOS_PRODUCTO
+        stmt = select(*(getattr(Producto, c) for c in columnas))
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    async def count(self) -> int:
+        result = await self.session.execute(select(func.count()).select_from(Producto))
+        return result.scalar_one()
+
     async def get_by_id(self, producto_id: int) -> Producto | None:
         return await self.session.get(Producto, producto_id)
 
+    async def get_by_id_fila(self, producto_id: int, campos: Optional[Iterable[str]] = None) -> Row | None:
+        columnas = resolver_campos(campos) or CAMPOS_PRODUCTO
+        stmt = select(*(getattr(Producto, c) for c in columnas)).where(Producto.id == producto_id)
+        result = await self.session.execute(stmt)
+        return result.first()
+
     async def update(self, producto_id: int, producto_data: ProductoUpdate) -> Producto | None:
         db_producto = await self.get_by_id(producto_id)
         if not db_producto:
@@ -32,6 +107,8 @@ class ProductoRepository:
         self.session.add(db_producto)
         await self.session.commit()
         await self.session.refresh(db_producto)
+        if self.snapshot is not None:
+            self.snapshot.aplicar(db_producto.id, db_producto.nombre, db_producto.precio)
         return db_producto
 
     async def delete(self, producto_id: int) -> bool:
@@ -40,4 +117,167 @@ class ProductoRepository:
             return False
         await self.session.delete(db_producto)
         await self.session.commit()
-        return True
\ No newline at end of file
+        if self.snapshot is not None:
+            self.snapshot.aplicar_baja(producto_id)
+        return True
+
+    def _snapshot_utilizable(self) -> bool:
+        return self.snapshot is not None and self.snapshot.es_fresco(self.snapshot_max_antiguedad)
+
+    async def get_by_precio(
+        self,
+        precio_min: Optional[float] = None,
+        precio_max: Optional[float] = None,
+        limite: Optional[int] = None,
+        descendente: bool = False,
+    ) -> Sequence:
+        """Productos (id, nombre, precio) con precio en [precio_min, precio_max), ordenados por precio.
+
+        Responde desde el snapshot en memoria si está cargado y es suficientemente reciente;
+        si no, con SQL.
+        """
+        if self._snapshot_utilizable():
+            return self.snapshot.rango(precio_min, precio_max, limite, descendente)
+
+        stmt = select(Producto.id, Producto.nombre, Producto.precio)
+        if precio_min is not None:
+            stmt = stmt.where(Producto.precio >= precio_min)
+        if precio_max is not None:
+            stmt = stmt.where(Producto.precio < precio_max)
+        if descendente:
+            stmt = stmt.order_by(Producto.precio.desc(), Producto.id.desc())
+        else:
+            stmt = stmt.order_by(Producto.precio, Producto.id)
+        if limite is not None:
+            stmt = stmt.limit(limite)
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    async def get_percentil_precio(self, q: float) -> float | None:
+        """Percentil de precio por rango más cercano (q entre 0 y 1)."""
+        if self._snapshot_utilizable():
+            return self.snapshot.percentil(q)
+
+        total = await self.count()
+        if not total:
+            return None
+        stmt = (
+            select(Producto.precio)
+            .order_by(Producto.precio)
+            .offset(max(0, math.ceil(q * total) - 1))
+            .limit(1)
+        )
+        return (await self.session.execute(stmt)).scalar_one()
+
+    async def reprice(self, datos: ProductoReprice) -> ProductoRepriceResult:
+        """Ajusta el precio de todos los productos del filtro con un único UPDATE ... WHERE.
+
+        Con `tamano_lote` se recorre la tabla por rangos de id y se confirma cada lote,
+        para que los bloqueos de fila duren lo que tarda un lote y no la operación completa.
+        Si no queda plazo para otro lote se detiene y devuelve el progreso (`completo=False`,
+        `ultimo_id`) en vez de dejar que la petición se cancele a mitad.
+        """
+        condiciones = condiciones_reprice(datos)
+
+        if datos.dry_run:
+            stmt = select(func.count()).select_from(Producto).where(*condiciones)
+            afectados = (await self.session.execute(stmt)).scalar_one()
+            return ProductoRepriceResult(afectados=afectados, dry_run=True)
+
+        if self.snapshot is not None:
+            # Cambio masivo: se descarta el snapshot hasta la siguiente recarga
+            self.snapshot.invalidar()
+
+        try:
+            if not datos.tamano_lote:
+                # Una sola transacción: si vence el plazo se revierte entera y reintentar es seguro
+                result = await self.session.execute(sentencia_reprice(datos, condiciones))
+                await self.session.commit()
+                return ProductoRepriceResult(afectados=result.rowcount, dry_run=False)
+
+            id_min, id_max = await self.rango_ids(condiciones)
+            return await recorrer_lotes(
+                datos, id_min, id_max, lambda desde, hasta: self.reprice_lote(datos, desde, hasta)
+            )
+        finally:
+            if self.snapshot is not None:
+                # Otra vez tras confirmar: una recarga que leyó antes del commit no debe quedar fresca
+                self.snapshot.invalidar()
+
+    async def rango_ids(self, condiciones: list) -> tuple[int | None, int | None]:
+        """Menor y mayor id de los productos que cumplen las condiciones."""
+        rango = select(func.min(Producto.id), func.max(Producto.id)).where(*condiciones)
+        id_min, id_max = (await self.session.execute(rango)).one()
+        await self.session.commit()
+        return id_min, id_max
+
+    async def reprice_lote(self, datos: ProductoReprice, desde: int, hasta: int) -> int:
+        """Aplica el ajuste a los ids en [desde, hasta) en su propia transacción."""
+        stmt = sentencia_reprice(datos, condiciones_reprice(datos)).where(
+            Producto.id >= desde, Producto.id < hasta
+        )
+        result = await self.session.execute(stmt)
+        await self.session.commit()
+        return result.rowcount
+
+
+# Tiempo (s) que se reserva para responder tras el último lote de un reprecio
+MARGEN_RESPUESTA_LOTE = 0.5
+
+
+def condiciones_reprice(datos: ProductoReprice) -> list:
+    condiciones = []
+    if datos.precio_min is not None:
+        condiciones.append(Producto.precio >= datos.precio_min)
+    if datos.precio_max is not None:
+        condiciones.append(Producto.precio < datos.precio_max)
+    if datos.desde_id is not None:
+        condiciones.append(Producto.id >= datos.desde_id)
+    return condiciones
+
+
+def sentencia_reprice(datos: ProductoReprice, condiciones: list):
+    if datos.porcentaje is not None:
+        nuevo_precio = Producto.precio * (1 + datos.porcentaje / 100)
+    else:
+        nuevo_precio = Producto.precio + datos.absoluto
+    if datos.redondeo is not None:
+        # round(double, int) no existe en Postgres: se redondea como numeric
+        nuevo_precio = cast(func.round(cast(nuevo_precio, Numeric), datos.redondeo), Float)
+    return (
+        update(Producto)
+        .where(*condiciones)
+        .values(precio=nuevo_precio)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def queda_tiempo_para_lote(duracion_lote: float) -> bool:
+    restante = tiempo_restante()
+    return restante is None or restante > 2 * duracion_lote + MARGEN_RESPUESTA_LOTE
+
+
+async def recorrer_lotes(
+    datos: ProductoReprice,
+    id_min: int | None,
+    id_max: int | None,
+    aplicar_lote: Callable[[int, int], Awaitable[int]],
+    detener: Optional[Callable[[], bool]] = None,
+) -> ProductoRepriceResult:
+    """Recorre [id_min, id_max] en lotes de `tamano_lote` mientras quede plazo para otro lote.
+
+    `detener` permite cortar antes del siguiente lote por otro motivo (p. ej. un shard caído).
+    """
+    if id_min is None:
+        return ProductoRepriceResult(afectados=0, dry_run=False)
+    afectados = 0
+    duracion_max = 0.0
+    for desde in range(id_min, id_max + 1, datos.tamano_lote):
+        if not queda_tiempo_para_lote(duracion_max) or (detener is not None and detener()):
+            return ProductoRepriceResult(
+                afectados=afectados, dry_run=False, completo=False, ultimo_id=desde - 1
+            )
+        inicio = time.monotonic()
+        afectados += await aplicar_lote(desde, desde + datos.tamano_lote)
+        duracion_max = max(duracion_max, time.monotonic() - inicio)
+    return ProductoRepriceResult(afectados=afectados, dry_run=False, ultimo_id=id_max)
@@ -0,0 +1,361 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import weakref
+from typing import Iterable, Optional
+
+from pydantic import PrivateAttr
+from sqlalchemy import BigInteger, Column, Integer, MetaData, Table, func, text, update
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import SQLModel, select
+
+from app.core.database import ShardRouter
+from app.models.item import (
+    Producto,
+    ProductoCreate,
+    ProductoReprice,
+    ProductoRepriceResult,
+    ProductoUpdate,
+)
+from app.repositories.producto_repository import ProductoRepository, condiciones_reprice, recorrer_lotes
+
+logger = logging.getLogger(__name__)
+
+
+class ResultadoParcial(list):
+    """Resultado de un scatter-gather: se comporta como una lista y además indica qué shards fallaron."""
+
+    def __init__(self, elementos: Iterable = (), errores: Optional[dict[int, Exception]] = None):
+        super().__init__(elementos)
+        self.errores = errores or {}
+
+    @property
+    def completo(self) -> bool:
+        return not self.errores
+
+
+class ConteoParcial(int):
+    """Conteo de un scatter-gather: un int que, como `ResultadoParcial`, indica qué shards fallaron."""
+
+    def __new__(cls, valor: int, errores: Optional[dict[int, Exception]] = None):
+        conteo = super().__new__(cls, valor)
+        conteo.errores = errores or {}
+        return conteo
+
+    @property
+    def completo(self) -> bool:
+        return not self.errores
+
+
+class PrecioParcial(float):
+    """Precio calculado sobre los shards que respondieron; `errores` indica los que fallaron."""
+
+    def __new__(cls, valor: float, errores: Optional[dict[int, Exception]] = None):
+        precio = super().__new__(cls, valor)
+        precio.errores = errores or {}
+        return precio
+
+    @property
+    def completo(self) -> bool:
+        return not self.errores
+
+
+class RepriceParcial(ProductoRepriceResult):
+    """Resultado de un reprecio repartido; con shards fallidos `completo` es False."""
+    _errores: dict[int, Exception] = PrivateAttr(default_factory=dict)
+
+    @property
+    def errores(self) -> dict[int, Exception]:
+        return self._errores
+
+
+class ShardLocalRepository(ProductoRepository):
+    """Repositorio sobre la sesión de un único shard (sin despacho ni snapshot en memoria)."""
+    snapshot = None
+
+    async def precio_en_posicion(self, posicion: int) -> float:
+        """Precio en la posición `posicion` (desde 0) del shard ordenado por precio."""
+        stmt = select(Producto.precio).order_by(Producto.precio).offset(posicion).limit(1)
+        return (await self.session.execute(stmt)).scalar_one()
+
+    async def contar_precios(self, pivote: float) -> tuple[int, int]:
+        """Productos del shard con precio < pivote y con precio <= pivote."""
+        stmt = select(
+            func.count().filter(Producto.precio < pivote),
+            func.count().filter(Producto.precio <= pivote),
+        )
+        menores, hasta = (await self.session.execute(stmt)).one()
+        return menores, hasta
+
+
+# Secuencia de ids de cada shard. En PostgreSQL es una SEQUENCE nativa; en otros motores
+# (SQLite en pruebas y entornos locales) una fila contador que se incrementa con UPDATE
+SECUENCIA_IDS = "producto_id_shard_seq"
+_contador_ids = Table(
+    "producto_id_shard",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("ultimo", BigInteger, nullable=False),
+)
+
+
+class GeneradorIds:
+    """Genera ids globalmente únicos: el shard k solo asigna ids con `id % n == k`.
+
+    Cada shard tiene su propia secuencia (`INCREMENT BY n START WITH k'`, con k' el primer id
+    libre con residuo k) guardada en su base de datos: es monótona entre reinicios, no
+    reutiliza ids de productos borrados y la comparten todos los procesos que escriben en
+    el shard. Se crea en el primer uso a partir del máximo id existente.
+    """
+
+    def __init__(self, router: ShardRouter):
+        self.router = router
+        self._preparados: set[int] = set()
+        self._locks = [asyncio.Lock() for _ in range(len(router))]
+
+    def _es_postgres(self, shard: int) -> bool:
+        return self.router.engines[shard].dialect.name == "postgresql"
+
+    async def _preparar(self, shard: int) -> None:
+        async with self._locks[shard]:
+            if shard in self._preparados:
+                return
+            n = len(self.router)
+            async with self.router.engines[shard].begin() as conn:
+                maximo = (await conn.execute(select(func.max(Producto.id)))).scalar_one() or 0
+                # Menor id mayor que el máximo con residuo `shard` (nunca 0)
+                inicio = maximo + 1 + (shard - (maximo + 1)) % n
+                if self._es_postgres(shard):
+                    await conn.execute(text(
+                        f"CREATE SEQUENCE IF NOT EXISTS {SECUENCIA_IDS} INCREMENT BY {n} START WITH {inicio}"
+                    ))
+                else:
+                    await conn.run_sync(_contador_ids.create, checkfirst=True)
+                    existe = (await conn.execute(select(_contador_ids.c.id))).first()
+                    if existe is None:
+                        await conn.execute(_contador_ids.insert().values(id=1, ultimo=inicio - n))
+            self._preparados.add(shard)
+
+    async def siguiente(self, session: AsyncSession, shard: int) -> int:
+        """Reserva el siguiente id del shard dentro de la transacción de `session`."""
+        await self._preparar(shard)
+        if self._es_postgres(shard):
+            return (await session.execute(text(f"SELECT nextval('{SECUENCIA_IDS}')"))).scalar_one()
+        # El UPDATE bloquea la fila contador hasta el commit del alta
+        stmt = (
+            update(_contador_ids)
+            .values(ultimo=_contador_ids.c.ultimo + len(self.router))
+            .returning(_contador_ids.c.ultimo)
+        )
+        return (await session.execute(stmt)).scalar_one()
+
+
+class ShardedProductoRepository:
+    """Repositorio de productos repartido entre varias bases de datos.
+
+    Las operaciones por id van al shard `id % n`; las altas se reparten por turnos y reciben
+    un id de ese shard. Listados, conteos y búsquedas consultan todos los shards en paralelo
+    y combinan los resultados ordenados; si un shard falla se devuelve lo obtenido del resto
+    como `ResultadoParcial` con el error en `errores`.
+    """
+
+    # Un generador por router: lo comparten todas las peticiones del proceso
+    _generadores: "weakref.WeakKeyDictionary[ShardRouter, GeneradorIds]" = weakref.WeakKeyDictionary()
+    _turno = itertools.count()
+
+    def __init__(self, router: ShardRouter):
+        self.router = router
+        self.ids = self._generadores.get(router)
+        if self.ids is None:
+            self.ids = self._generadores[router] = GeneradorIds(router)
+
+    async def crear_tablas(self) -> None:
+        """Crea el esquema en todos los shards (pruebas y entornos locales; en producción, Alembic)."""
+        for engine in self.router.engines:
+            async with engine.begin() as conn:
+                await conn.run_sync(SQLModel.metadata.create_all)
+
+    async def _en_shard(self, shard: int, operacion):
+        async with self.router.sesion(shard) as session:
+            return await operacion(ShardLocalRepository(session))
+
+    async def _en_shards(self, shards: Iterable[int], operacion) -> tuple[dict[int, object], dict[int, Exception]]:
+        shards = list(shards)
+        resultados = await asyncio.gather(
+            *(self._en_shard(shard, operacion) for shard in shards), return_exceptions=True
+        )
+        correctos, errores = {}, {}
+        for shard, resultado in zip(shards, resultados):
+            if isinstance(resultado, Exception):
+                logger.warning("Shard %d no disponible: %s", shard, resultado)
+                errores[shard] = resultado
+            else:
+                correctos[shard] = resultado
+        return correctos, errores
+
+    async def _en_todos(self, operacion) -> tuple[list, dict[int, Exception]]:
+        correctos, errores = await self._en_shards(range(len(self.router)), operacion)
+        return list(correctos.values()), errores
+
+    # --- Operaciones puntuales (enrutadas por id) ---
+
+    async def create(self, producto_data: ProductoCreate) -> Producto:
+        shard = next(self._turno) % len(self.router)
+        async with self.router.sesion(shard) as session:
+            producto_id = await self.ids.siguiente(session, shard)
+            db_producto = Producto(id=producto_id, **producto_data.dict())
+            session.add(db_producto)
+            await session.commit()
+            await session.refresh(db_producto)
+            return db_producto
+
+    async def get_by_id(self, producto_id: int) -> Producto | None:
+        return await self._en_shard(self.router.shard_de(producto_id), lambda r: r.get_by_id(producto_id))
+
+    async def get_by_id_fila(self, producto_id: int, campos: Optional[Iterable[str]] = None):
+        return await self._en_shard(
+            self.router.shard_de(producto_id), lambda r: r.get_by_id_fila(producto_id, campos)
+        )
+
+    async def update(self, producto_id: int, producto_data: ProductoUpdate) -> Producto | None:
+        return await self._en_shard(
+            self.router.shard_de(producto_id), lambda r: r.update(producto_id, producto_data)
+        )
+
+    async def delete(self, producto_id: int) -> bool:
+        return await self._en_shard(self.router.shard_de(producto_id), lambda r: r.delete(producto_id))
+
+    # --- Scatter-gather ---
+
+    async def get_all(self) -> ResultadoParcial:
+        async def listar(repo):
+            result = await repo.session.execute(select(Producto).order_by(Producto.id))
+            return result.scalars().all()
+
+        partes, errores = await self._en_todos(listar)
+        return ResultadoParcial(heapq.merge(*partes, key=lambda p: p.id), errores)
+
+    async def get_all_filas(self, campos: Optional[Iterable[str]] = None) -> ResultadoParcial:
+        async def listar(repo):
+            # get_all_filas no ordena; el merge necesita cada parte ordenada por id
+            return sorted(await repo.get_all_filas(campos), key=lambda f: f.id)
+
+        partes, errores = await self._en_todos(listar)
+        return ResultadoParcial(heapq.merge(*partes, key=lambda f: f.id), errores)
+
+    async def count(self) -> ConteoParcial:
+        partes, errores = await self._en_todos(lambda r: r.count())
+        return ConteoParcial(sum(partes), errores)
+
+    async def get_by_precio(
+        self,
+        precio_min: Optional[float] = None,
+        precio_max: Optional[float] = None,
+        limite: Optional[int] = None,
+        descendente: bool = False,
+    ) -> ResultadoParcial:
+        # Cada shard devuelve como mucho `limite` filas ya ordenadas; el merge corta al límite
+        partes, errores = await self._en_todos(
+            lambda r: r.get_by_precio(precio_min, precio_max, limite, descendente)
+        )
+        combinadas = heapq.merge(*partes, key=lambda f: (f.precio, f.id), reverse=descendente)
+        return ResultadoParcial(itertools.islice(combinadas, limite), errores)
+
+    async def get_percentil_precio(self, q: float) -> PrecioParcial | None:
+        """Percentil por rango más cercano sin traer los precios: selección por pivotes.
+
+        Se busca el k-ésimo precio global acotando en cada shard el intervalo de posiciones
+        donde puede estar. En cada ronda se toma como pivote el precio central (ORDER BY ...
+        OFFSET) del shard con más candidatos y se cuenta en todos cuántos precios son menores
+        o iguales; el intervalo de ese shard se reduce al menos a la mitad por ronda. Los
+        shards que fallan se descartan y el cálculo se repite con el resto.
+        """
+        totales, errores = await self._en_shards(range(len(self.router)), lambda r: r.count())
+        while True:
+            total = sum(totales.values())
+            if not total:
+                if errores:
+                    # Ningún shard con datos respondió: no hay un valor parcial que devolver
+                    raise next(iter(errores.values()))
+                return None
+            k = max(0, math.ceil(q * total) - 1)
+            precio, fallos = await self._seleccionar(totales, k)
+            if precio is not None:
+                return PrecioParcial(precio, errores)
+            errores.update(fallos)
+            # Shard caído (se descarta) o datos cambiados durante la selección: se recuenta
+            totales, nuevos = await self._en_shards(
+                [shard for shard in totales if shard not in fallos], lambda r: r.count()
+            )
+            errores.update(nuevos)
+
+    async def _seleccionar(
+        self, totales: dict[int, int], k: int
+    ) -> tuple[Optional[float], dict[int, Exception]]:
+        inferior = {shard: 0 for shard in totales}
+        superior = dict(totales)
+        while True:
+            shard = max(totales, key=lambda s: superior[s] - inferior[s])
+            if superior[shard] <= inferior[shard]:
+                return None, {}  # las cuentas dejaron de cuadrar: hubo escrituras
+            medio = (inferior[shard] + superior[shard]) // 2
+            try:
+                pivote = await self._en_shard(shard, lambda r: r.precio_en_posicion(medio))
+            except NoResultFound:
+                return None, {}
+            except Exception as e:
+                logger.warning("Shard %d no disponible: %s", shard, e)
+                return None, {shard: e}
+            cuentas, fallos = await self._en_shards(totales, lambda r: r.contar_precios(pivote))
+            if fallos:
+                return None, fallos
+            menores = sum(c[0] for c in cuentas.values())
+            hasta = sum(c[1] for c in cuentas.values())
+            if menores <= k < hasta:
+                return pivote, {}
+            for s, (menores_s, hasta_s) in cuentas.items():
+                if k < menores:
+                    superior[s] = min(superior[s], menores_s)
+                else:
+                    inferior[s] = max(inferior[s], hasta_s)
+
+    async def reprice(self, datos: ProductoReprice) -> RepriceParcial:
+        """Reprecio en todos los shards; si alguno falla, `completo=False` y el error en `errores`.
+
+        No se deshace nada en los shards que ya confirmaron el ajuste. Por lotes, un fallo
+        detiene el recorrido tras la ventana en curso: `ultimo_id` es el final de esa ventana,
+        que no se aplicó en los shards de `errores`.
+        """
+        if datos.dry_run or not datos.tamano_lote:
+            partes, errores = await self._en_todos(lambda r: r.reprice(datos))
+            resultado = ProductoRepriceResult(afectados=sum(p.afectados for p in partes), dry_run=datos.dry_run)
+        else:
+            # Por lotes, todos los shards avanzan por la misma ventana de ids: así `ultimo_id`
+            # es el mismo en todos y reanudar con desde_id no repite el ajuste en ninguno
+            condiciones = condiciones_reprice(datos)
+            rangos, errores = await self._en_todos(lambda r: r.rango_ids(condiciones))
+            minimos = [id_min for id_min, _ in rangos if id_min is not None]
+            maximos = [id_max for _, id_max in rangos if id_max is not None]
+
+            async def aplicar_lote(desde: int, hasta: int) -> int:
+                partes, fallos = await self._en_todos(lambda r: r.reprice_lote(datos, desde, hasta))
+                errores.update(fallos)
+                return sum(partes)
+
+            resultado = await recorrer_lotes(
+                datos,
+                min(minimos, default=None),
+                max(maximos, default=None),
+                aplicar_lote,
+                detener=lambda: bool(errores),
+            )
+
+        if errores:
+            logger.error("Reprecio incompleto: fallaron los shards %s", sorted(errores))
+        parcial = RepriceParcial(**resultado.model_dump())
+        parcial.completo = resultado.completo and not errores
+        parcial._errores = errores
+        return parcial
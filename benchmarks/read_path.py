@@ -0,0 +1,113 @@
+"""Benchmark del camino de lectura: listado de N productos por protocolo.
+
+Compara el camino ORM (entidad -> Pydantic/Strawberry/protobuf) con las filas de solo
+lectura y los conversores compartidos. Uso:
+
+    python -m benchmarks.read_path --filas 10000
+"""
+import argparse
+import asyncio
+import os
+import time
+import tracemalloc
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlmodel import SQLModel
+
+import app.grpc.producto_pb2 as pb2
+from app.api.v1.endpoints.items import filas_a_json
+from app.graphql.types import ProductoType, producto_desde_fila
+from app.grpc.server import a_lista
+from app.models.item import Producto, ProductoParcial
+from app.repositories.producto_repository import ProductoRepository
+
+_LISTA_PARCIAL = TypeAdapter(list[ProductoParcial])
+
+
+async def rest_orm(repo):
+    productos = await repo.get_all()
+    # Equivalente a response_model=list[...] en FastAPI: validar y serializar
+    return _LISTA_PARCIAL.dump_json(
+        _LISTA_PARCIAL.validate_python(productos, from_attributes=True), exclude_unset=True
+    )
+
+
+async def rest_filas(repo):
+    return filas_a_json(await repo.get_all_filas()).body
+
+
+async def graphql_orm(repo):
+    return [ProductoType.from_pydantic(p) for p in await repo.get_all()]
+
+
+async def graphql_filas(repo):
+    return [producto_desde_fila(f) for f in await repo.get_all_filas()]
+
+
+async def grpc_orm(repo):
+    productos = await repo.get_all()
+    respuestas = [
+        pb2.ProductoResponse(id=p.id, nombre=p.nombre, descripcion=p.descripcion or "", precio=p.precio)
+        for p in productos
+    ]
+    return pb2.ProductoListResponse(productos=respuestas).SerializeToString()
+
+
+async def grpc_filas(repo):
+    return a_lista(await repo.get_all_filas()).SerializeToString()
+
+
+CASOS = [
+    ("rest", rest_orm, rest_filas),
+    ("graphql", graphql_orm, graphql_filas),
+    ("grpc", grpc_orm, grpc_filas),
+]
+
+
+async def medir(engine, funcion, filas: int, repeticiones: int) -> tuple[float, float]:
+    """Devuelve (filas por segundo, pico de memoria en KiB) de la mejor repetición."""
+    mejor_tiempo, mejor_pico = float("inf"), float("inf")
+    for _ in range(repeticiones):
+        # Sesión nueva por repetición, como en una petición real
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            repo = ProductoRepository(session)
+            tracemalloc.start()
+            inicio = time.perf_counter()
+            await funcion(repo)
+            transcurrido = time.perf_counter() - inicio
+            _, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        mejor_tiempo = min(mejor_tiempo, transcurrido)
+        mejor_pico = min(mejor_pico, pico / 1024)
+    return filas / mejor_tiempo, mejor_pico
+
+
+async def main(filas: int, repeticiones: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.execute(
+            Producto.__table__.insert(),
+            [
+                {"nombre": f"Producto {i}", "descripcion": f"Descripción del producto {i}", "precio": i * 0.5}
+                for i in range(filas)
+            ],
+        )
+
+    print(f"{'protocolo':<10}{'camino':<8}{'filas/s':>14}{'pico KiB':>12}")
+    for protocolo, antes, ahora in CASOS:
+        for nombre, funcion in (("orm", antes), ("filas", ahora)):
+            por_segundo, pico = await medir(engine, funcion, filas, repeticiones)
+            print(f"{protocolo:<10}{nombre:<8}{por_segundo:>14,.0f}{pico:>12,.0f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filas", type=int, default=10_000)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.filas, args.repeticiones))
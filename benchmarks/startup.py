@@ -0,0 +1,112 @@
+"""Benchmark de arranque por punto de entrada: tiempo de import y tiempo hasta la primera petición.
+
+El tiempo de import se obtiene con `python -X importtime`; el de primera petición lanza el
+proceso real (uvicorn o el servidor gRPC) y sondea hasta obtener una respuesta. Uso:
+
+    python -m benchmarks.startup --repeticiones 3
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+PUERTO_HTTP = 8765
+PUERTO_GRPC = 50051
+
+ENTRADAS = {
+    "main": "app.main",
+    "rest": "app.entrypoints.rest",
+    "graphql": "app.entrypoints.graphql",
+    "grpc": "app.entrypoints.grpc",
+}
+
+
+def entorno() -> dict:
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.gettempdir()}/arranque.db")
+    env["PYTHONPATH"] = os.getcwd()
+    return env
+
+
+def tiempo_import(modulo: str) -> float:
+    """Tiempo acumulado (ms) de importar el módulo en un intérprete nuevo."""
+    salida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        capture_output=True, text=True, env=entorno(), check=True,
+    ).stderr
+    # Formato: "import time: <propio> | <acumulado> | <módulo>" (microsegundos)
+    for linea in salida.splitlines():
+        _, acumulado, nombre = linea.split("|")
+        if nombre.strip() == modulo:
+            return int(acumulado) / 1000
+    raise RuntimeError(f"No se encontró {modulo} en la salida de -X importtime")
+
+
+def _primera_peticion_http(nombre: str) -> None:
+    if nombre == "graphql":
+        peticion = urllib.request.Request(
+            f"http://127.0.0.1:{PUERTO_HTTP}/graphql",
+            data=b'{"query": "{ __typename }"}',
+            headers={"Content-Type": "application/json"},
+        )
+    else:
+        peticion = urllib.request.Request(f"http://127.0.0.1:{PUERTO_HTTP}/")
+    urllib.request.urlopen(peticion, timeout=1).read()
+
+
+def _primera_peticion_grpc() -> None:
+    import grpc
+    import app.grpc.producto_pb2 as pb2
+    import app.grpc.producto_pb2_grpc as pb2_grpc
+
+    with grpc.insecure_channel(f"127.0.0.1:{PUERTO_GRPC}") as canal:
+        stub = pb2_grpc.ProductoServiceStub(canal)
+        try:
+            stub.GetProducto(pb2.GetProductoRequest(id=0), timeout=1)
+        except grpc.RpcError as e:
+            # Cualquier respuesta del servidor cuenta; UNAVAILABLE es que aún no escucha
+            if e.code() == grpc.StatusCode.UNAVAILABLE:
+                raise
+
+
+def tiempo_primera_peticion(nombre: str, modulo: str, limite: float = 30.0) -> float:
+    """Milisegundos desde lanzar el proceso hasta la primera respuesta."""
+    if nombre == "grpc":
+        comando = [sys.executable, "-m", modulo]
+    else:
+        comando = [sys.executable, "-m", "uvicorn", f"{modulo}:app", "--port", str(PUERTO_HTTP), "--log-level", "warning"]
+
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen(comando, env=entorno(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - inicio < limite:
+            try:
+                if nombre == "grpc":
+                    _primera_peticion_grpc()
+                else:
+                    _primera_peticion_http(nombre)
+                return (time.perf_counter() - inicio) * 1000
+            except Exception:
+                time.sleep(0.01)
+        raise TimeoutError(f"{modulo} no respondió en {limite} s")
+    finally:
+        proceso.terminate()
+        proceso.wait()
+
+
+def main(repeticiones: int) -> None:
+    print(f"{'entrada':<10}{'import ms':>12}{'1ª petición ms':>18}")
+    for nombre, modulo in ENTRADAS.items():
+        importacion = min(tiempo_import(modulo) for _ in range(repeticiones))
+        primera = min(tiempo_primera_peticion(nombre, modulo) for _ in range(repeticiones))
+        print(f"{nombre:<10}{importacion:>12,.0f}{primera:>18,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+    main(args.repeticiones)
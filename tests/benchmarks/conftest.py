@@ -0,0 +1,114 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+from app.models.item import Producto
+from tests.benchmarks.medicion import Medicion
+
+LINEAS_BASE = Path(__file__).with_name("baselines.json")
+
+_resultados: dict[str, Medicion] = {}
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--bench"):
+        return
+    omitir = pytest.mark.skip(reason="micro-benchmarks: ejecutar con --bench")
+    for item in items:
+        if "benchmarks" in item.nodeid.split("::")[0]:
+            item.add_marker(omitir)
+
+
+def pytest_generate_tests(metafunc):
+    if "tamano" in metafunc.fixturenames:
+        tamanos = [int(t) for t in metafunc.config.getoption("--bench-tamanos").split(",") if t.strip()]
+        metafunc.parametrize("tamano", tamanos)
+
+
+def _poblar(url: str, tamano: int) -> None:
+    async def crear():
+        engine = create_async_engine(url)
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+            filas = [
+                {"nombre": f"Producto {i}", "descripcion": f"Descripción del producto {i}", "precio": (i * 7919) % 1000 / 10}
+                for i in range(tamano)
+            ]
+            for inicio in range(0, tamano, 10_000):
+                await conn.execute(Producto.__table__.insert(), filas[inicio:inicio + 10_000])
+        await engine.dispose()
+
+    asyncio.run(crear())
+
+
+@pytest.fixture(scope="session")
+def base_de_datos(tmp_path_factory):
+    """Devuelve la URL de una base SQLite en proceso con `tamano` productos (se crea una vez por tamaño)."""
+    urls: dict[int, str] = {}
+
+    def obtener(tamano: int) -> str:
+        if tamano not in urls:
+            ruta = tmp_path_factory.mktemp("bench") / f"productos_{tamano}.db"
+            urls[tamano] = f"sqlite+aiosqlite:///{ruta}"
+            _poblar(urls[tamano], tamano)
+        return urls[tamano]
+
+    return obtener
+
+
+@pytest.fixture(scope="session")
+def lineas_base(request):
+    datos = json.loads(LINEAS_BASE.read_text()) if LINEAS_BASE.exists() else {}
+    datos.setdefault("presupuesto", {})
+    datos.setdefault("mediciones", {})
+    yield datos
+    if request.config.getoption("--bench-actualizar") and _resultados:
+        for clave, medicion in _resultados.items():
+            datos["mediciones"][clave] = {"tiempo_ms": round(medicion.tiempo_ms, 4)}
+            if medicion.memoria_kib is not None:
+                datos["mediciones"][clave]["memoria_kib"] = round(medicion.memoria_kib, 1)
+        datos["mediciones"] = dict(sorted(datos["mediciones"].items()))
+        LINEAS_BASE.write_text(json.dumps(datos, indent=2, ensure_ascii=False) + "\n")
+
+
+@pytest.fixture
+def presupuesto(request, lineas_base):
+    """Registra una medición y falla si supera el presupuesto derivado de su línea base.
+
+    Presupuesto = línea base × tolerancia + holgura fija (para absorber el ruido en
+    mediciones de microsegundos). Sin línea base solo se registra la medición; la memoria
+    solo se comprueba en las mediciones que la miden.
+    """
+    def comprobar(clave: str, medicion: Medicion) -> None:
+        _resultados[clave] = medicion
+        base = lineas_base["mediciones"].get(clave)
+        if base is None or request.config.getoption("--bench-actualizar"):
+            return
+        config = lineas_base["presupuesto"]
+        limite_tiempo = base["tiempo_ms"] * config.get("tolerancia_tiempo", 2.0) + config.get("holgura_ms", 1.0)
+        errores = []
+        if medicion.tiempo_ms > limite_tiempo:
+            errores.append(f"tiempo {medicion.tiempo_ms:.3f} ms > {limite_tiempo:.3f} ms (base {base['tiempo_ms']} ms)")
+        if medicion.memoria_kib is not None and "memoria_kib" in base:
+            limite_memoria = base["memoria_kib"] * config.get("tolerancia_memoria", 1.3) + config.get("holgura_kib", 64)
+            if medicion.memoria_kib > limite_memoria:
+                errores.append(f"memoria {medicion.memoria_kib:.1f} KiB > {limite_memoria:.1f} KiB (base {base['memoria_kib']} KiB)")
+        if errores:
+            pytest.fail(f"{clave} supera su presupuesto: " + "; ".join(errores), pytrace=False)
+
+    return comprobar
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _resultados:
+        return
+    terminalreporter.section("micro-benchmarks")
+    terminalreporter.write_line(f"{'benchmark':<52}{'tiempo ms':>12}{'pico KiB':>12}{'bloques':>10}")
+    for clave, m in sorted(_resultados.items()):
+        memoria = "-" if m.memoria_kib is None else f"{m.memoria_kib:.1f}"
+        bloques = "-" if m.bloques is None else m.bloques
+        terminalreporter.write_line(f"{clave:<52}{m.tiempo_ms:>12.3f}{memoria:>12}{bloques:>10}")
@@ -0,0 +1,81 @@
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class Medicion:
+    tiempo_ms: float     # mejor tiempo de las repeticiones
+    memoria_kib: Optional[float]  # pico de memoria asignada durante una ejecución (None: no se mide)
+    bloques: Optional[int]        # bloques de memoria que siguen vivos al terminar (resultado incluido)
+
+
+def repeticiones_para(tamano: int) -> int:
+    return 10 if tamano <= 100 else 5 if tamano <= 10_000 else 3
+
+
+def _medir_memoria(resultado_de) -> tuple[float, int]:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        resultado = resultado_de()
+        _, pico = tracemalloc.get_traced_memory()
+        bloques = sum(s.count for s in tracemalloc.take_snapshot().statistics("filename"))
+    finally:
+        tracemalloc.stop()
+    del resultado
+    return pico / 1024, bloques
+
+
+def medir(funcion, repeticiones: int, memoria: bool = True) -> Medicion:
+    """Mide una función síncrona: tiempo sin tracemalloc y memoria en una ejecución aparte.
+
+    Con `memoria=False` solo se mide el tiempo, para funciones cuya memoria la reserva
+    código C que tracemalloc no ve, como los mensajes protobuf (upb).
+    """
+    funcion()  # calentamiento
+    tiempos = []
+    # Sin recolector cíclico durante el cronometraje, como timeit: sus pausas son el mayor ruido
+    gc.disable()
+    try:
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            funcion()
+            tiempos.append(time.perf_counter() - inicio)
+    finally:
+        gc.enable()
+    memoria_kib, bloques = _medir_memoria(funcion) if memoria else (None, None)
+    return Medicion(min(tiempos) * 1000, memoria_kib, bloques)
+
+
+async def medir_async(funcion, repeticiones: int, preparar=None, limpiar=None) -> Medicion:
+    """Igual que `medir` para corrutinas; `preparar` se ejecuta fuera del tiempo medido y su
+    resultado se pasa a `funcion`. `limpiar(resultado)`, también fuera del tiempo medido,
+    deshace lo que hizo `funcion` para que la tabla conserve su tamaño entre repeticiones."""
+    async def una_vez():
+        argumento = await preparar() if preparar else None
+        inicio = time.perf_counter()
+        resultado = await (funcion(argumento) if preparar else funcion())
+        duracion = time.perf_counter() - inicio
+        if limpiar:
+            await limpiar(resultado)
+        return duracion
+
+    await una_vez()  # calentamiento (conexión del pool, cachés de compilación SQL)
+    tiempos = [await una_vez() for _ in range(repeticiones)]
+
+    argumento = await preparar() if preparar else None
+    gc.collect()
+    tracemalloc.start()
+    try:
+        resultado = await (funcion(argumento) if preparar else funcion())
+        _, pico = tracemalloc.get_traced_memory()
+        bloques = sum(s.count for s in tracemalloc.take_snapshot().statistics("filename"))
+    finally:
+        tracemalloc.stop()
+    if limpiar:
+        await limpiar(resultado)
+    del resultado
+    return Medicion(min(tiempos) * 1000, pico / 1024, bloques)
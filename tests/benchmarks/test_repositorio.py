@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models.item import Producto, ProductoCreate, ProductoReprice, ProductoUpdate
+from app.repositories.producto_repository import ProductoRepository
+from tests.benchmarks.medicion import medir_async, repeticiones_para
+
+# nombre -> (operación sobre el repositorio, preparación y limpieza opcionales fuera del
+# tiempo medido). Las escrituras dejan la tabla con el tamaño indicado tras cada repetición.
+OPERACIONES = {
+    "get_all": (lambda repo, _: repo.get_all(), None, None),
+    "get_all_filas": (lambda repo, _: repo.get_all_filas(), None, None),
+    "get_all_filas_campos": (lambda repo, _: repo.get_all_filas(["nombre", "precio"]), None, None),
+    "count": (lambda repo, _: repo.count(), None, None),
+    "get_by_id": (lambda repo, _: repo.get_by_id(1), None, None),
+    "get_by_id_fila": (lambda repo, _: repo.get_by_id_fila(1), None, None),
+    "get_by_precio": (lambda repo, _: repo.get_by_precio(10, 50, limite=10), None, None),
+    "get_percentil_precio": (lambda repo, _: repo.get_percentil_precio(0.5), None, None),
+    "create": (
+        lambda repo, _: repo.create(ProductoCreate(nombre="Nuevo", precio=1.5)),
+        None,
+        lambda repo, creado: repo.delete(creado.id),
+    ),
+    "update": (lambda repo, _: repo.update(1, ProductoUpdate(descripcion="Actualizado")), None, None),
+    "delete": (
+        lambda repo, id_: repo.delete(id_),
+        lambda repo: repo.create(ProductoCreate(nombre="Efímero", precio=1.0)),
+        None,
+    ),
+    "reprice_dry_run": (lambda repo, _: repo.reprice(ProductoReprice(porcentaje=10, dry_run=True)), None, None),
+    "reprice": (lambda repo, _: repo.reprice(ProductoReprice(absoluto=0)), None, None),
+}
+
+
+def _medir_operacion(url: str, operacion, preparar, limpiar, repeticiones: int):
+    async def ejecutar():
+        engine = create_async_engine(url)
+        fabrica = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        # Sesión nueva en cada repetición, como en una petición real
+        async def llamar(argumento=None):
+            async with fabrica() as session:
+                return await operacion(ProductoRepository(session), argumento)
+
+        async def preparacion():
+            async with fabrica() as session:
+                return (await preparar(ProductoRepository(session))).id
+
+        async def limpieza(resultado):
+            async with fabrica() as session:
+                await limpiar(ProductoRepository(session), resultado)
+
+        try:
+            return await medir_async(
+                llamar, repeticiones, preparacion if preparar else None, limpieza if limpiar else None
+            )
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(ejecutar())
+
+
+def _contar(url: str) -> int:
+    async def contar():
+        engine = create_async_engine(url)
+        try:
+            async with engine.connect() as conn:
+                return (await conn.execute(select(func.count()).select_from(Producto))).scalar_one()
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(contar())
+
+
+@pytest.mark.parametrize("nombre", list(OPERACIONES))
+def test_repositorio(nombre, tamano, base_de_datos, presupuesto):
+    operacion, preparar, limpiar = OPERACIONES[nombre]
+    url = base_de_datos(tamano)
+    medicion = _medir_operacion(url, operacion, preparar, limpiar, repeticiones_para(tamano))
+    presupuesto(f"repositorio.{nombre}[{tamano}]", medicion)
+    assert _contar(url) == tamano, "la operación cambió el tamaño de la tabla"
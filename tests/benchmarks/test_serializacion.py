@@ -0,0 +1,64 @@
+from collections import namedtuple
+
+import pytest
+
+import app.grpc.producto_pb2 as pb2
+from app.api.v1.endpoints.items import filas_a_json
+from app.graphql.types import ProductoType, producto_desde_fila
+from app.grpc.server import a_lista
+from app.models.item import Producto, ProductoCreate, ProductoUpdate
+from app.repositories.producto_repository import CAMPOS_PRODUCTO
+from tests.benchmarks.medicion import medir, repeticiones_para
+
+# Sustituto de `sqlalchemy.Row` con la misma forma (tupla con `_fields`)
+Fila = namedtuple("Fila", CAMPOS_PRODUCTO)
+
+
+def _datos(tamano: int) -> list[dict]:
+    return [
+        {"nombre": f"Producto {i}", "descripcion": f"Descripción del producto {i}", "precio": (i * 7919) % 1000 / 10}
+        for i in range(tamano)
+    ]
+
+
+def _productos(tamano: int) -> list[Producto]:
+    return [Producto(id=i + 1, **d) for i, d in enumerate(_datos(tamano))]
+
+
+def _filas(tamano: int) -> list[Fila]:
+    return [Fila(i + 1, d["nombre"], d["descripcion"], d["precio"]) for i, d in enumerate(_datos(tamano))]
+
+
+def _mensajes_pb2(productos):
+    respuesta = pb2.ProductoListResponse()
+    respuesta.productos.extend(
+        pb2.ProductoResponse(id=p.id, nombre=p.nombre, descripcion=p.descripcion or "", precio=p.precio)
+        for p in productos
+    )
+    return respuesta
+
+
+# nombre -> (construcción de la entrada fuera del tiempo medido, conversión medida)
+CONVERSIONES = {
+    "validar_producto_create": (_datos, lambda datos: [ProductoCreate(**d) for d in datos]),
+    "validar_producto_update": (_datos, lambda datos: [ProductoUpdate(**d) for d in datos]),
+    "graphql_from_pydantic": (_productos, lambda productos: [ProductoType.from_pydantic(p) for p in productos]),
+    "graphql_desde_fila": (_filas, lambda filas: [producto_desde_fila(f) for f in filas]),
+    "protobuf_por_mensaje": (_productos, _mensajes_pb2),
+    "protobuf_a_lista": (_filas, a_lista),
+    "protobuf_serializar": (lambda tamano: a_lista(_filas(tamano)), lambda respuesta: respuesta.SerializeToString()),
+    "rest_filas_a_json": (_filas, filas_a_json),
+}
+
+
+# upb reserva los mensajes en C, fuera del alcance de tracemalloc: estos casos solo tienen
+# presupuesto de tiempo
+SOLO_TIEMPO = {"protobuf_por_mensaje", "protobuf_a_lista"}
+
+
+@pytest.mark.parametrize("nombre", list(CONVERSIONES))
+def test_serializacion(nombre, tamano, presupuesto):
+    construir, convertir = CONVERSIONES[nombre]
+    entrada = construir(tamano)
+    medicion = medir(lambda: convertir(entrada), repeticiones_para(tamano), memoria=nombre not in SOLO_TIEMPO)
+    presupuesto(f"serializacion.{nombre}[{tamano}]", medicion)
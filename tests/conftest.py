@@ -0,0 +1,41 @@
+import os
+from pathlib import Path
+
+# Las pruebas usan SQLite en memoria; debe fijarse antes de la primera llamada a
+# get_settings(), que se cachea (lru_cache) con el entorno de ese momento
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+def pytest_configure(config):
+    # Los stubs gRPC no se versionan: se generan desde el .proto si faltan o están desfasados
+    proto = RAIZ / "app" / "grpc" / "producto.proto"
+    stubs = [proto.with_name("producto_pb2.py"), proto.with_name("producto_pb2_grpc.py")]
+    if all(s.exists() and s.stat().st_mtime >= proto.stat().st_mtime for s in stubs):
+        return
+    import grpc_tools
+    from grpc_tools import protoc
+
+    # Como `python -m grpc_tools.protoc`: incluye los .proto estándar (field_mask.proto)
+    estandar = Path(grpc_tools.__file__).parent / "_proto"
+    argumentos = [
+        "protoc", f"-I{RAIZ}", f"-I{estandar}", f"--python_out={RAIZ}", f"--grpc_python_out={RAIZ}", str(proto)
+    ]
+    if protoc.main(argumentos) != 0:
+        raise RuntimeError("No se pudieron generar los stubs gRPC desde producto.proto")
+
+
+def pytest_addoption(parser):
+    grupo = parser.getgroup("benchmarks", "Micro-benchmarks con presupuestos (tests/benchmarks)")
+    grupo.addoption("--bench", action="store_true", help="Ejecuta los micro-benchmarks.")
+    grupo.addoption(
+        "--bench-tamanos",
+        default="1,100,10000",
+        help="Tamaños de tabla / número de objetos, separados por coma (p. ej. 1,100,10000,100000).",
+    )
+    grupo.addoption(
+        "--bench-actualizar",
+        action="store_true",
+        help="Guarda las mediciones como nuevas líneas base en lugar de comprobar los presupuestos.",
+    )
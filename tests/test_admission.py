@@ -0,0 +1,109 @@
+import asyncio
+import pytest
+from app.core.admission import AdmissionController, Prioridad, SobrecargaError
+
+
+def controlador(**kwargs):
+    opciones = {"limites": {"rest": 1}, "max_cola": 1, "espera_max": 0.2}
+    opciones.update(kwargs)
+    return AdmissionController(**opciones)
+
+
+@pytest.mark.asyncio
+async def test_rechaza_cuando_la_cola_esta_llena():
+    ctrl = controlador()
+    await ctrl.adquirir("rest")
+    en_espera = asyncio.create_task(ctrl.adquirir("rest", Prioridad.LISTADO))
+    await asyncio.sleep(0)
+
+    with pytest.raises(SobrecargaError):
+        await ctrl.adquirir("rest", Prioridad.LISTADO)
+
+    ctrl.liberar("rest")
+    await en_espera
+    assert ctrl.estadisticas()["protocolos"]["rest"]["en_curso"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lectura_puntual_desplaza_a_escritura_masiva():
+    ctrl = controlador()
+    await ctrl.adquirir("rest")
+    masiva = asyncio.create_task(ctrl.adquirir("rest", Prioridad.MASIVA))
+    await asyncio.sleep(0)
+    puntual = asyncio.create_task(ctrl.adquirir("rest", Prioridad.PUNTUAL))
+    await asyncio.sleep(0)
+
+    with pytest.raises(SobrecargaError):
+        await masiva
+    ctrl.liberar("rest")
+    await puntual
+
+
+@pytest.mark.asyncio
+async def test_la_espera_vence_con_el_plazo():
+    ctrl = controlador(espera_max=0.01)
+    await ctrl.adquirir("rest")
+    with pytest.raises(SobrecargaError):
+        await ctrl.adquirir("rest")
+    assert ctrl.estadisticas()["protocolos"]["rest"]["en_cola"] == 0
+
+
+def test_limite_adaptativo_por_espera_del_pool():
+    ctrl = controlador(limites={"rest": 10}, intervalo_recorte=0)
+    for _ in range(20):
+        ctrl.registrar_espera_pool(1.0)
+    assert ctrl.estadisticas()["protocolos"]["rest"]["limite"] < 10
+
+    for _ in range(500):
+        ctrl.registrar_espera_pool(0.0)
+    assert ctrl.estadisticas()["protocolos"]["rest"]["limite"] == 10
+
+
+def test_clasifica_operaciones_graphql():
+    from app.graphql.app import clasificar_operacion
+
+    assert clasificar_operacion("{ getProducto(id: 1) { nombre } }") == Prioridad.PUNTUAL
+    assert clasificar_operacion("query { getProductos { id } }") == Prioridad.LISTADO
+    assert clasificar_operacion("mutation { deleteProducto(id: 1) }") == Prioridad.PUNTUAL
+    assert clasificar_operacion("mutation { repriceProductos(porcentaje: 5) { afectados } }") == Prioridad.MASIVA
+    # Varios campos raíz: cuenta el de menor prioridad
+    assert clasificar_operacion("{ getProducto(id: 1) { id } getProductos { id } }") == Prioridad.LISTADO
+    # Con varias operaciones se clasifica la indicada en operationName
+    documento = "query A { getProducto(id: 1) { id } } mutation B { repriceProductos(absoluto: 1) { afectados } }"
+    assert clasificar_operacion(documento, "A") == Prioridad.PUNTUAL
+    assert clasificar_operacion(documento, "B") == Prioridad.MASIVA
+    assert clasificar_operacion("{ __schema { types { name } } }") == Prioridad.LISTADO
+    assert clasificar_operacion("{ roto") == Prioridad.LISTADO
+
+
+@pytest.mark.asyncio
+async def test_graphql_admite_con_la_prioridad_de_la_operacion(monkeypatch):
+    from httpx import ASGITransport, AsyncClient
+    from sqlmodel import SQLModel
+    from app.api import deps
+    from app.core.database import get_engine
+    from app.main import app
+
+    async with get_engine().begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    ctrl = controlador(limites={"graphql": 10})
+    vistas = []
+    original = ctrl.adquirir
+
+    async def adquirir(protocolo, prioridad=Prioridad.PUNTUAL):
+        vistas.append(prioridad)
+        await original(protocolo, prioridad)
+
+    monkeypatch.setattr(ctrl, "adquirir", adquirir)
+    monkeypatch.setattr(deps, "get_admission", lambda: ctrl)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        lectura = await ac.post("/graphql", json={"query": "{ getProducto(id: 1) { id } }"})
+        reprecio = await ac.post("/graphql", json={"query": "mutation { repriceProductos(absoluto: 1, dryRun: true) { afectados } }"})
+
+    # El cuerpo leído para clasificar sigue disponible para Strawberry
+    assert lectura.json() == {"data": {"getProducto": None}}
+    assert reprecio.json()["data"]["repriceProductos"]["afectados"] >= 0
+    assert vistas == [Prioridad.PUNTUAL, Prioridad.MASIVA]
+    assert ctrl.estadisticas()["protocolos"]["graphql"]["en_curso"] == 0
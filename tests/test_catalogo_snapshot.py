@@ -0,0 +1,142 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+import pytest_asyncio
+from sqlmodel import SQLModel
+from app.core.database import get_engine, get_sessionmaker
+from app.models.item import Producto, ProductoReprice
+from app.repositories.catalogo_snapshot import CatalogoSnapshot
+from app.repositories.producto_repository import ProductoRepository
+
+
+@pytest.fixture
+def snapshot():
+    snap = CatalogoSnapshot()
+    for producto_id, precio in [(1, 30.0), (2, 10.0), (3, 20.0), (4, 20.0), (5, 50.0)]:
+        snap.aplicar(producto_id, f"p{producto_id}", precio)
+    return snap
+
+
+def test_rango_semiabierto_ordenado_por_precio(snapshot):
+    filas = snapshot.rango(precio_min=10, precio_max=30)
+    assert [f.precio for f in filas] == [10.0, 20.0, 20.0]
+    assert filas[0].nombre == "p2"
+
+
+def test_top_n(snapshot):
+    assert [f.id for f in snapshot.rango(limite=2)] == [2, 3]
+    assert [f.id for f in snapshot.rango(limite=2, descendente=True)] == [5, 1]
+
+
+def test_escrituras_incrementales(snapshot):
+    snapshot.aplicar(2, "p2", 60.0)
+    snapshot.aplicar_baja(5)
+    assert [f.id for f in snapshot.rango()] == [3, 4, 1, 2]
+    assert len(snapshot) == 4
+
+
+def test_percentil(snapshot):
+    assert snapshot.percentil(0) == 10.0
+    assert snapshot.percentil(0.5) == 20.0
+    assert snapshot.percentil(1) == 50.0
+    assert CatalogoSnapshot().percentil(0.5) is None
+
+
+def test_sin_carga_no_es_fresco(snapshot):
+    assert snapshot.antiguedad() is None
+    assert not snapshot.es_fresco(60)
+
+
+class SesionLenta:
+    """Sesión falsa cuyo SELECT queda en espera hasta que la prueba lo libera."""
+
+    def __init__(self, filas):
+        self.filas = filas
+        self.leyendo = asyncio.Event()
+        self.liberar = asyncio.Event()
+
+    async def execute(self, stmt):
+        self.leyendo.set()
+        await self.liberar.wait()
+        return SimpleNamespace(all=lambda: self.filas)
+
+
+def sesion_inmediata(filas):
+    session = SesionLenta(filas)
+    session.liberar.set()
+    return session
+
+
+@pytest_asyncio.fixture
+async def sesion():
+    async with get_engine().begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+    async with get_sessionmaker()() as session:
+        for nombre, precio in [("a", 30.0), ("b", 10.0), ("c", 20.0)]:
+            session.add(Producto(nombre=nombre, precio=precio))
+        await session.commit()
+        yield session
+
+
+@pytest.mark.asyncio
+async def test_cargar_desde_la_base_de_datos(sesion):
+    snap = CatalogoSnapshot()
+    assert not snap.es_fresco(60)
+    await snap.cargar(sesion)
+    assert [(f.id, f.nombre, f.precio) for f in snap.rango()] == [(2, "b", 10.0), (3, "c", 20.0), (1, "a", 30.0)]
+    assert snap.es_fresco(60)
+
+
+@pytest.mark.asyncio
+async def test_escrituras_durante_la_carga_se_reaplican():
+    snap = CatalogoSnapshot()
+    session = SesionLenta([(1, "a", 30.0), (2, "b", 10.0)])
+    carga = asyncio.create_task(snap.cargar(session))
+    await session.leyendo.wait()
+    # Confirmadas mientras el SELECT estaba en curso (el resultado no las incluye)
+    snap.aplicar(3, "c", 5.0)
+    snap.aplicar(1, "a", 40.0)
+    snap.aplicar_baja(2)
+    session.liberar.set()
+    await carga
+
+    assert [(f.id, f.precio) for f in snap.rango()] == [(3, 5.0), (1, 40.0)]
+    assert snap.es_fresco(60)
+
+
+@pytest.mark.asyncio
+async def test_invalidacion_durante_la_carga_no_queda_fresca():
+    snap = CatalogoSnapshot()
+    session = SesionLenta([(1, "a", 30.0)])
+    carga = asyncio.create_task(snap.cargar(session))
+    await session.leyendo.wait()
+    snap.invalidar()
+    session.liberar.set()
+    await carga
+
+    assert len(snap) == 1
+    assert not snap.es_fresco(60)
+    await snap.cargar(sesion_inmediata([(1, "a", 33.0)]))
+    assert snap.es_fresco(60)
+
+
+@pytest.mark.asyncio
+async def test_repositorio_vuelve_a_sql_si_el_snapshot_no_es_fresco(sesion, monkeypatch):
+    # Snapshot con datos distintos de la base para saber de dónde sale la respuesta
+    snap = CatalogoSnapshot()
+    await snap.cargar(sesion_inmediata([(9, "memoria", 1.0)]))
+    monkeypatch.setattr(ProductoRepository, "snapshot", snap)
+    monkeypatch.setattr(ProductoRepository, "snapshot_max_antiguedad", 60.0)
+    repo = ProductoRepository(sesion)
+
+    assert [f.id for f in await repo.get_by_precio()] == [9]
+    assert await repo.get_percentil_precio(0.5) == 1.0
+
+    snap.cargado_en -= 61  # más antiguo que la tolerancia
+    assert [f.id for f in await repo.get_by_precio()] == [2, 3, 1]
+    assert await repo.get_percentil_precio(0.5) == 20.0
+
+    await snap.cargar(sesion_inmediata([(9, "memoria", 1.0)]))
+    await repo.reprice(ProductoReprice(absoluto=1))  # invalida el snapshot
+    assert [f.precio for f in await repo.get_by_precio()] == [11.0, 21.0, 31.0]
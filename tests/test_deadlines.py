@@ -0,0 +1,72 @@
+import asyncio
+import time
+import pytest
+from app.core.deadlines import PlazoMiddleware, deadline_actual, desconexiones, tiempo_restante, timeouts
+
+
+def peticion(desconectar_en=None):
+    mensajes = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if mensajes:
+            return mensajes.pop()
+        if desconectar_en is None:
+            await asyncio.Event().wait()
+        await asyncio.sleep(desconectar_en)
+        return {"type": "http.disconnect"}
+
+    return receive
+
+
+@pytest.mark.asyncio
+async def test_plazo_vencido_responde_504_y_se_cuenta():
+    vistos = []
+
+    async def lenta(scope, receive, send):
+        vistos.append(tiempo_restante())
+        await asyncio.sleep(1)
+
+    enviados = []
+
+    async def send(mensaje):
+        enviados.append(mensaje)
+
+    antes = timeouts["rest"]
+    await PlazoMiddleware(lenta, presupuesto=0.05)({"type": "http"}, peticion(), send)
+
+    assert enviados[0]["status"] == 504
+    assert timeouts["rest"] == antes + 1
+    assert 0 < vistos[0] <= 0.05
+
+
+@pytest.mark.asyncio
+async def test_desconexion_cancela_el_handler():
+    cancelado = asyncio.Event()
+
+    async def lenta(scope, receive, send):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelado.set()
+            raise
+
+    async def send(mensaje):
+        raise AssertionError("no debe responder a un cliente desconectado")
+
+    antes = desconexiones["rest"]
+    await PlazoMiddleware(lenta, presupuesto=5)({"type": "http"}, peticion(desconectar_en=0.01), send)
+
+    assert cancelado.is_set()
+    assert desconexiones["rest"] == antes + 1
+
+
+def test_reprice_por_lotes_reserva_plazo_para_responder():
+    from app.repositories.producto_repository import MARGEN_RESPUESTA_LOTE, queda_tiempo_para_lote
+
+    assert queda_tiempo_para_lote(5.0)  # sin plazo
+    token = deadline_actual.set(time.monotonic() + MARGEN_RESPUESTA_LOTE + 1)
+    try:
+        assert queda_tiempo_para_lote(0.1)
+        assert not queda_tiempo_para_lote(0.6)
+    finally:
+        deadline_actual.reset(token)
@@ -0,0 +1,61 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.entrypoints.http import crear_app
+from app.graphql.app import GraphQLPerezoso
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+def modulos_importados(modulo: str) -> set[str]:
+    """Importa `modulo` en un intérprete limpio y devuelve los paquetes raíz que cargó."""
+    codigo = (
+        f"import json, sys, {modulo}; "
+        "print(json.dumps(sorted({m.split('.')[0] for m in sys.modules})))"
+    )
+    salida = subprocess.run(
+        [sys.executable, "-c", codigo],
+        cwd=RAIZ,
+        env={**os.environ, "DATABASE_URL": "sqlite+aiosqlite:///:memory:"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(salida.stdout.splitlines()[-1]))
+
+
+@pytest.mark.parametrize(
+    "modulo, ausentes",
+    [
+        ("app.entrypoints.rest", {"strawberry"}),
+        ("app.entrypoints.grpc", {"strawberry", "fastapi"}),
+    ],
+)
+def test_punto_de_entrada_no_importa_otros_protocolos(modulo, ausentes):
+    assert not modulos_importados(modulo) & ausentes
+
+
+def test_punto_de_entrada_graphql_aplaza_strawberry():
+    assert "strawberry" not in modulos_importados("app.entrypoints.graphql")
+
+
+@pytest.mark.asyncio
+async def test_graphql_perezoso_construye_en_la_primera_llamada():
+    app = crear_app(rest=False, graphql=True)
+    graphql = next(r.app for r in app.routes if isinstance(getattr(r, "app", None), GraphQLPerezoso))
+    assert graphql._app is None
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post("/graphql", json={"query": "{ __typename }"})
+        construida = graphql._app
+        await ac.post("/graphql", json={"query": "{ __typename }"})
+
+    assert response.json() == {"data": {"__typename": "Query"}}
+    assert construida is not None
+    assert graphql._app is construida
@@ -0,0 +1,160 @@
+import asyncio
+import grpc
+import pytest
+import pytest_asyncio
+from google.protobuf.field_mask_pb2 import FieldMask
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.exc import DBAPIError
+from sqlmodel import SQLModel
+
+import app.grpc.producto_pb2 as pb2
+import app.grpc.producto_pb2_grpc as pb2_grpc
+from app.core.admission import get_admission
+from app.core.database import get_engine, get_sessionmaker
+from app.core.deadlines import desconexiones, timeouts
+from app.grpc.server import ProductoServicer, a_lista, a_respuesta
+from app.main import app
+from app.models.item import Producto
+from app.repositories.producto_repository import ProductoRepository
+
+
+@pytest_asyncio.fixture
+async def stub():
+    async with get_engine().begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    server = grpc.aio.server()
+    pb2_grpc.add_ProductoServiceServicer_to_server(ProductoServicer(), server)
+    puerto = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    async with grpc.aio.insecure_channel(f"127.0.0.1:{puerto}") as canal:
+        stub = pb2_grpc.ProductoServiceStub(canal)
+        await stub.CreateProducto(pb2.CreateProductoRequest(nombre="Teclado", descripcion="Mecánico", precio=120.5))
+        await stub.CreateProducto(pb2.CreateProductoRequest(nombre="Ratón", precio=20))
+        yield stub
+    await server.stop(None)
+
+
+@pytest.mark.asyncio
+async def test_get_all_productos_con_field_mask(stub):
+    completos = await stub.GetAllProductos(pb2.GetAllProductosRequest())
+    parciales = await stub.GetAllProductos(pb2.GetAllProductosRequest(field_mask=FieldMask(paths=["precio"])))
+
+    assert [(p.id, p.nombre, p.descripcion, p.precio) for p in completos.productos] == [
+        (1, "Teclado", "Mecánico", 120.5),
+        (2, "Ratón", "", 20.0),
+    ]
+    # Solo viajan el id (siempre incluido) y los campos pedidos
+    assert [[f.name for f, _ in p.ListFields()] for p in parciales.productos] == [
+        ["id", "precio"],
+        ["id", "precio"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_producto_con_field_mask(stub):
+    producto = await stub.GetProducto(pb2.GetProductoRequest(id=1, field_mask=FieldMask(paths=["nombre"])))
+    assert [f.name for f, _ in producto.ListFields()] == ["id", "nombre"]
+    assert producto.nombre == "Teclado"
+
+    with pytest.raises(grpc.aio.AioRpcError) as error:
+        await stub.GetProducto(pb2.GetProductoRequest(id=99))
+    assert error.value.code() == grpc.StatusCode.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_field_mask_con_campo_desconocido(stub):
+    for llamada in (
+        stub.GetProducto(pb2.GetProductoRequest(id=1, field_mask=FieldMask(paths=["color"]))),
+        stub.GetAllProductos(pb2.GetAllProductosRequest(field_mask=FieldMask(paths=["precio", "color"]))),
+    ):
+        with pytest.raises(grpc.aio.AioRpcError) as error:
+            await llamada
+        assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+        assert "color" in error.value.details()
+
+
+async def filas(campos=None):
+    async with get_sessionmaker()() as session:
+        return await ProductoRepository(session).get_all_filas(campos)
+
+
+@pytest.mark.asyncio
+async def test_conversores_con_filas_completas_y_parciales(stub):
+    completas = await filas()
+    parciales = await filas(["nombre"])
+
+    assert a_respuesta(completas[1]) == pb2.ProductoResponse(id=2, nombre="Ratón", descripcion="", precio=20)
+    assert a_respuesta(parciales[0]) == pb2.ProductoResponse(id=1, nombre="Teclado")
+    assert [f.name for f, _ in a_respuesta(parciales[0]).ListFields()] == ["id", "nombre"]
+    assert list(a_lista(completas).productos) == [a_respuesta(f) for f in completas]
+    assert list(a_lista(parciales).productos) == [a_respuesta(f) for f in parciales]
+    assert a_lista([]) == pb2.ProductoListResponse()
+
+    # Entidad ORM (altas y actualizaciones)
+    entidad = Producto(id=3, nombre="Monitor", descripcion=None, precio=150)
+    assert a_respuesta(entidad) == pb2.ProductoResponse(id=3, nombre="Monitor", precio=150)
+
+
+@pytest.mark.asyncio
+async def test_statement_timeout_en_alta_es_deadline_exceeded(stub, monkeypatch):
+    class Cancelada(Exception):
+        sqlstate = "57014"
+
+    async def create(self, producto_data):
+        raise DBAPIError("INSERT", {}, Cancelada("canceling statement due to statement timeout"))
+
+    monkeypatch.setattr(ProductoRepository, "create", create)
+    antes = timeouts["grpc"]
+    with pytest.raises(grpc.aio.AioRpcError) as error:
+        await stub.CreateProducto(pb2.CreateProductoRequest(nombre="Lento", precio=1))
+
+    assert error.value.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+    assert timeouts["grpc"] == antes + 1
+    assert get_admission().estadisticas()["timeouts"]["grpc"] == timeouts["grpc"]
+
+
+@pytest.mark.asyncio
+async def test_deadline_del_cliente_cuenta_como_timeout_no_desconexion(stub, monkeypatch):
+    async def create(self, producto_data):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            # Un driver que tarda en atender la cancelación: vence antes el deadline de gRPC
+            await asyncio.sleep(0.3)
+            raise
+
+    monkeypatch.setattr(ProductoRepository, "create", create)
+    antes_timeouts, antes_desconexiones = timeouts["grpc"], desconexiones["grpc"]
+    with pytest.raises(grpc.aio.AioRpcError) as error:
+        await stub.CreateProducto(pb2.CreateProductoRequest(nombre="Lento", precio=1), timeout=0.2)
+
+    assert error.value.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+    # El servidor puede enterarse del vencimiento un instante después que el cliente
+    for _ in range(50):
+        if timeouts["grpc"] > antes_timeouts:
+            break
+        await asyncio.sleep(0.01)
+    assert timeouts["grpc"] == antes_timeouts + 1
+    assert desconexiones["grpc"] == antes_desconexiones
+
+
+@pytest.mark.asyncio
+async def test_statement_timeout_en_graphql_responde_504(monkeypatch):
+    class Cancelada(Exception):
+        sqlstate = "57014"
+
+    async def create(self, producto_data):
+        raise DBAPIError("INSERT", {}, Cancelada("canceling statement due to statement timeout"))
+
+    monkeypatch.setattr(ProductoRepository, "create", create)
+    antes = timeouts["graphql"]
+    consulta = 'mutation { createProducto(nombre: "Lento", precio: 1) { id } }'
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post("/graphql", json={"query": consulta})
+
+    assert response.status_code == 504
+    assert "INSERT" not in response.text
+    assert timeouts["graphql"] == antes + 1
+    assert get_admission().estadisticas()["timeouts"]["graphql"] == timeouts["graphql"]
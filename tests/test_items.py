@@ -1,17 +1,97 @@
+import json
 import pytest
-from httpx import AsyncClient
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlmodel import SQLModel
+from app.api.v1.endpoints.items import filas_a_json
+from app.core.database import get_engine, get_sessionmaker
 from app.main import app
+from app.repositories import producto_repository
+from app.repositories.producto_repository import ProductoRepository
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def tablas():
+    async with get_engine().begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+
+def cliente():
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
 
 @pytest.mark.asyncio
 async def test_create_item():
-    async with AsyncClient(app=app, base_url="http://test") as ac:
-        response = await ac.post("/api/v1/items/", json={"title": "Test Item", "description": "A test"})
+    async with cliente() as ac:
+        response = await ac.post("/api/v1/items/", json={"nombre": "Teclado", "descripcion": "Mecánico", "precio": 120.5})
     assert response.status_code == 201
-    assert response.json()["title"] == "Test Item"
+    assert response.json()["nombre"] == "Teclado"
+    assert response.json()["id"] is not None
 
 @pytest.mark.asyncio
 async def test_read_items():
-    async with AsyncClient(app=app, base_url="http://test") as ac:
+    async with cliente() as ac:
+        await ac.post("/api/v1/items/", json={"nombre": "Teclado", "precio": 120.5})
         response = await ac.get("/api/v1/items/")
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
\ No newline at end of file
+    assert response.json() == [{"id": 1, "nombre": "Teclado", "descripcion": None, "precio": 120.5}]
+
+@pytest.mark.asyncio
+async def test_read_items_fields():
+    async with cliente() as ac:
+        await ac.post("/api/v1/items/", json={"nombre": "Teclado", "descripcion": "Mecánico", "precio": 120.5})
+        response = await ac.get("/api/v1/items/?fields=precio")
+        invalida = await ac.get("/api/v1/items/?fields=color")
+    assert response.json() == [{"id": 1, "precio": 120.5}]
+    assert invalida.status_code == 400
+
+@pytest.mark.asyncio
+async def test_reprice_items():
+    async with cliente() as ac:
+        for precio in (10, 15, 30):
+            await ac.post("/api/v1/items/", json={"nombre": f"P{precio}", "precio": precio})
+        simulacion = await ac.post("/api/v1/items/reprice", json={"precio_max": 20, "porcentaje": 7, "dry_run": True})
+        response = await ac.post("/api/v1/items/reprice", json={"precio_max": 20, "porcentaje": 7})
+        precios = await ac.get("/api/v1/items/?fields=precio")
+    assert simulacion.json() == {"afectados": 2, "dry_run": True, "completo": True, "ultimo_id": None}
+    assert response.json() == {"afectados": 2, "dry_run": False, "completo": True, "ultimo_id": None}
+    assert [p["precio"] for p in precios.json()] == [10.7, 16.05, 30.0]
+
+@pytest.mark.asyncio
+async def test_reprice_por_lotes_se_detiene_y_reanuda(monkeypatch):
+    async with cliente() as ac:
+        for precio in (10, 15, 12, 30, 11):
+            await ac.post("/api/v1/items/", json={"nombre": f"P{precio}", "precio": precio})
+        completo = await ac.post("/api/v1/items/reprice", json={"precio_max": 20, "absoluto": 1, "tamano_lote": 2})
+
+        # Sin plazo para el tercer lote: responde con el progreso en vez de agotar el plazo
+        lotes = iter([True, True, False])
+        monkeypatch.setattr(producto_repository, "queda_tiempo_para_lote", lambda duracion: next(lotes, True))
+        parcial = await ac.post("/api/v1/items/reprice", json={"precio_max": 20, "porcentaje": 10, "tamano_lote": 1})
+        reanudado = await ac.post(
+            "/api/v1/items/reprice",
+            json={"precio_max": 20, "porcentaje": 10, "tamano_lote": 1, "desde_id": parcial.json()["ultimo_id"] + 1},
+        )
+        precios = await ac.get("/api/v1/items/?fields=precio")
+
+    assert completo.json() == {"afectados": 4, "dry_run": False, "completo": True, "ultimo_id": 5}
+    assert parcial.json() == {"afectados": 2, "dry_run": False, "completo": False, "ultimo_id": 2}
+    assert reanudado.json() == {"afectados": 2, "dry_run": False, "completo": True, "ultimo_id": 5}
+    # Cada producto recibe el porcentaje una sola vez
+    assert [p["precio"] for p in precios.json()] == [12.1, 17.6, 14.3, 30.0, 13.2]
+
+@pytest.mark.asyncio
+async def test_filas_a_json_completas_y_parciales():
+    async with cliente() as ac:
+        await ac.post("/api/v1/items/", json={"nombre": "Teclado", "precio": 120.5})
+    async with get_sessionmaker()() as session:
+        repo = ProductoRepository(session)
+        completas = await repo.get_all_filas()
+        parciales = await repo.get_all_filas(["nombre"])
+        fila = await repo.get_by_id_fila(1, ["precio"])
+
+    assert json.loads(filas_a_json(completas).body) == [{"id": 1, "nombre": "Teclado", "descripcion": None, "precio": 120.5}]
+    assert json.loads(filas_a_json(parciales).body) == [{"id": 1, "nombre": "Teclado"}]
+    assert json.loads(filas_a_json(fila).body) == {"id": 1, "precio": 120.5}
+    assert json.loads(filas_a_json([]).body) == []
@@ -0,0 +1,175 @@
+import asyncio
+import math
+import random
+import pytest
+import pytest_asyncio
+from app.core.database import ShardRouter
+from app.models.item import ProductoCreate, ProductoReprice, ProductoUpdate
+from app.repositories import producto_repository
+from app.repositories.producto_repository import ProductoRepository
+from app.repositories.sharding import ShardedProductoRepository
+
+
+@pytest_asyncio.fixture
+async def repo(tmp_path):
+    router = ShardRouter([f"sqlite+aiosqlite:///{tmp_path}/shard{i}.db" for i in range(3)])
+    repo = ShardedProductoRepository(router)
+    await repo.crear_tablas()
+    for i in range(10):
+        await repo.create(ProductoCreate(nombre=f"p{i}", precio=float(10 - i)))
+    yield repo
+    await router.dispose()
+
+
+@pytest.mark.asyncio
+async def test_ids_unicos_y_enrutados_por_shard(repo):
+    productos = await repo.get_all()
+    ids = [p.id for p in productos]
+    assert ids == sorted(set(ids)) and len(ids) == 10
+    assert {p.id % 3 for p in productos} == {0, 1, 2}
+
+    producto = await repo.get_by_id(ids[4])
+    assert producto.nombre == productos[4].nombre
+    actualizado = await repo.update(producto.id, ProductoUpdate(precio=99))
+    assert actualizado.precio == 99
+    assert await repo.delete(producto.id)
+    assert await repo.get_by_id(producto.id) is None
+    assert await repo.count() == 9
+
+
+@pytest.mark.asyncio
+async def test_busquedas_combinadas(repo):
+    baratos = await repo.get_by_precio(limite=3)
+    assert [f.precio for f in baratos] == [1.0, 2.0, 3.0]
+    caros = await repo.get_by_precio(precio_max=9, limite=2, descendente=True)
+    assert [f.precio for f in caros] == [8.0, 7.0]
+    assert await repo.get_percentil_precio(0.5) == 5.0
+
+    resultado = await repo.reprice(ProductoReprice(precio_max=3, absoluto=100))
+    assert resultado.afectados == 2
+
+
+async def romper_shard(repo, tmp_path, shard):
+    # El shard deja de estar disponible: su fichero pasa a ser un directorio
+    (tmp_path / f"shard{shard}.db").unlink()
+    (tmp_path / f"shard{shard}.db").mkdir()
+    await repo.router.engines[shard].dispose()
+
+
+@pytest.mark.asyncio
+async def test_fallo_de_shard_devuelve_resultado_parcial(repo, tmp_path):
+    await romper_shard(repo, tmp_path, 1)
+
+    productos = await repo.get_all()
+    assert not productos.completo
+    assert list(productos.errores) == [1]
+    assert productos and all(p.id % 3 != 1 for p in productos)
+
+
+@pytest.mark.asyncio
+async def test_las_capas_reciben_el_repositorio_particionado(repo, monkeypatch):
+    monkeypatch.setattr(producto_repository, "get_shard_router", lambda: repo.router)
+    assert isinstance(ProductoRepository(None), ShardedProductoRepository)
+
+
+@pytest.mark.asyncio
+async def test_reprice_por_lotes_avanza_igual_en_todos_los_shards(repo, monkeypatch):
+    lotes = iter([True, True, False])
+    monkeypatch.setattr(producto_repository, "queda_tiempo_para_lote", lambda duracion: next(lotes, True))
+    parcial = await repo.reprice(ProductoReprice(absoluto=100, tamano_lote=3))
+    assert (parcial.completo, parcial.ultimo_id, parcial.afectados) == (False, 6, 6)
+
+    resto = await repo.reprice(ProductoReprice(absoluto=100, tamano_lote=3, desde_id=parcial.ultimo_id + 1))
+    assert (resto.completo, resto.ultimo_id, resto.afectados) == (True, 10, 4)
+    assert sorted(f.precio for f in await repo.get_all_filas(["precio"])) == [float(p) for p in range(101, 111)]
+
+
+@pytest.mark.asyncio
+async def test_modo_shards_no_usa_la_base_principal(repo, monkeypatch):
+    from httpx import ASGITransport, AsyncClient
+    from app.core import database
+    from app.main import app
+
+    def sin_base_principal():
+        raise AssertionError("en modo shards no debe abrirse DATABASE_URL")
+
+    monkeypatch.setattr(database, "get_sessionmaker", sin_base_principal)
+    monkeypatch.setattr(database, "get_shard_router", lambda: repo.router)
+    monkeypatch.setattr(producto_repository, "get_shard_router", lambda: repo.router)
+    esperas = []
+    monkeypatch.setattr(database.get_admission(), "registrar_espera_pool", esperas.append)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        creado = await ac.post("/api/v1/items/", json={"nombre": "Nuevo", "precio": 1.5})
+        listado = await ac.get("/api/v1/items/?fields=precio")
+
+    assert creado.status_code == 201
+    assert len(listado.json()) == 11
+    # La espera del pool se mide en las sesiones de los shards
+    assert len(esperas) >= 1 + 3
+
+
+@pytest.mark.asyncio
+async def test_ids_no_se_reutilizan_tras_reiniciar(repo):
+    ultimo = max(p.id for p in await repo.get_all())
+    assert await repo.delete(ultimo)
+
+    # Otro proceso (router y generador nuevos) sobre los mismos shards
+    otro_router = ShardRouter(repo.router.urls)
+    try:
+        otro = ShardedProductoRepository(otro_router)
+        nuevos = [await otro.create(ProductoCreate(nombre=f"n{i}", precio=1.0)) for i in range(3)]
+    finally:
+        await otro_router.dispose()
+    assert min(p.id for p in nuevos) > ultimo
+
+
+@pytest.mark.asyncio
+async def test_ids_unicos_con_varios_procesos_escribiendo(repo):
+    otro_router = ShardRouter(repo.router.urls)
+    try:
+        otro = ShardedProductoRepository(otro_router)
+        creados = await asyncio.gather(*(
+            r.create(ProductoCreate(nombre=f"c{i}", precio=1.0)) for i in range(15) for r in (repo, otro)
+        ))
+    finally:
+        await otro_router.dispose()
+    ids = [p.id for p in creados]
+    assert len(set(ids)) == len(ids) == 30
+    assert await repo.count() == 40
+
+
+@pytest.mark.asyncio
+async def test_percentil_por_seleccion_coincide_con_el_rango_mas_cercano(repo):
+    rnd = random.Random(7)
+    for _ in range(60):
+        await repo.create(ProductoCreate(nombre="r", precio=float(rnd.randint(0, 15))))
+    precios = sorted(f.precio for f in await repo.get_all_filas(["precio"]))
+    for q in (0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1):
+        esperado = precios[max(0, math.ceil(q * len(precios)) - 1)]
+        resultado = await repo.get_percentil_precio(q)
+        assert resultado == esperado and resultado.completo
+
+
+@pytest.mark.asyncio
+async def test_fallo_de_shard_en_conteo_percentil_y_reprecio(repo, tmp_path):
+    vivos = sorted(p.precio for p in await repo.get_all() if p.id % 3 != 1)
+    await romper_shard(repo, tmp_path, 1)
+
+    conteo = await repo.count()
+    assert conteo == len(vivos) and not conteo.completo and list(conteo.errores) == [1]
+
+    mediana = await repo.get_percentil_precio(0.5)
+    assert mediana == vivos[math.ceil(0.5 * len(vivos)) - 1]
+    assert list(mediana.errores) == [1]
+
+    simulacion = await repo.reprice(ProductoReprice(absoluto=1, dry_run=True))
+    assert simulacion.afectados == len(vivos) and not simulacion.completo and list(simulacion.errores) == [1]
+
+    # Por lotes, el shard caído detiene el recorrido antes de aplicar ningún lote
+    por_lotes = await repo.reprice(ProductoReprice(absoluto=1, tamano_lote=2))
+    assert (por_lotes.afectados, por_lotes.completo) == (0, False)
+    assert list(por_lotes.errores) == [1]
+
+    resultado = await repo.reprice(ProductoReprice(absoluto=1))
+    assert resultado.afectados == len(vivos) and not resultado.completo